@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Stress benchmark: routing latency on very long prompts.
+
+Builds prompts of growing size the way they arrive in practice: a short
+instruction, then a pasted traceback and source file, then a closing
+question. Each size is routed in every mode with the default PROMPT_POLICY
+(bounded window) and with windowing disabled (whole prompt analyzed).
+Reports median and worst latency per size, and whether the windowed top-1
+matches the instruction routed on its own.
+
+Run: python3 tests/bench_long_prompts.py [--max-mb N] [--repeat N] > bench_output.txt
+"""
+
+import statistics
+import sys
+import time
+
+from skill_router import ROUTER_MODES, PromptPolicy, make_ranker
+
+INSTRUCTION = "Write unit tests for my agent's tool calling. It fails with the error below:"
+QUESTION = "How should I mock the LLM client in these tests?"
+TRACE_LINES = [
+    "Traceback (most recent call last):",
+    '  File "app/agent/core.py", line 88, in run_tool',
+    "    result = await self.tools[name](**arguments)",
+    '  File "app/deploy/docker_runner.py", line 41, in __call__',
+    "    raise RuntimeError(f'container {name} exited with {code}')",
+    "RuntimeError: container retriever exited with 137",
+]
+CODE_LINES = [
+    "def build_rag_index(documents, embeddings, vector_store):",
+    "    # chunk documents, embed them and upsert into the vector database",
+    "    chunks = [chunk for doc in documents for chunk in split(doc, 512)]",
+    "    vector_store.upsert(embeddings.embed(chunks))",
+    "class DeploymentConfig(BaseModel):",
+    "    kubernetes_namespace: str = 'agents'  # deploy observability dashboards",
+    "",
+]
+UNBOUNDED = PromptPolicy(max_chars=sys.maxsize)
+SIZES_KB = (1, 16, 256, 1024, 4096, 16384)
+
+
+def long_prompt(size_kb):
+    """Instruction + traceback + fenced source file + question, about size_kb KB."""
+    target = size_kb * 1024
+    body = []
+    size = 0
+    while size < target:
+        for line in TRACE_LINES + ["```python"] + CODE_LINES * 20 + ["```"]:
+            body.append(line)
+            size += len(line) + 1
+    return "\n".join([INSTRUCTION] + body + [QUESTION])
+
+
+def time_route(rank, prompt, repeat):
+    timings = []
+    routing = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        routing = rank(prompt)
+        timings.append(time.perf_counter() - started)
+    return timings, routing
+
+
+def run(max_mb=16, repeat=5):
+    from test_skills_behavioral import load_all_skills
+
+    skills = load_all_skills()
+    rows = []
+    for mode in ROUTER_MODES:
+        bounded = make_ranker(skills, mode)
+        unbounded = make_ranker(skills, mode, UNBOUNDED)
+        expected = bounded(f"{INSTRUCTION} {QUESTION}")
+        expected_top = expected[0][0] if expected else None
+        for size_kb in (s for s in SIZES_KB if s <= max_mb * 1024):
+            prompt = long_prompt(size_kb)
+            row = {"mode": mode, "kb": len(prompt) // 1024}
+            for label, rank in (("window", bounded), ("full", unbounded)):
+                timings, routing = time_route(rank, prompt, repeat)
+                row[label] = (statistics.median(timings), max(timings))
+                row[f"{label}_top"] = routing[0][0] if routing else None
+            row["expected_top"] = expected_top
+            rows.append(row)
+    return rows
+
+
+def print_report(rows):
+    width = max(len(mode) for mode in ROUTER_MODES)
+    print("=" * 96)
+    print("  AGENT SKILL KIT — LONG-PROMPT ROUTING BENCHMARK")
+    print("=" * 96)
+    print(f"  {'mode':<{width}} {'size':>9}  {'window p50/max (ms)':>20}  {'full p50/max (ms)':>20}  top-1 window / full")
+    for row in rows:
+        window = "{:.2f} / {:.2f}".format(*(t * 1000 for t in row["window"]))
+        full = "{:.1f} / {:.1f}".format(*(t * 1000 for t in row["full"]))
+        ok = "ok" if row["window_top"] == row["expected_top"] else f"expected {row['expected_top']}"
+        print(f"  {row['mode']:<{width}} {row['kb']:>6} KB  {window:>20}  {full:>20}  "
+              f"{row['window_top']} ({ok}) / {row['full_top']}")
+    print("=" * 96)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    max_mb = float(args[args.index("--max-mb") + 1]) if "--max-mb" in args else 16
+    repeat = int(args[args.index("--repeat") + 1]) if "--repeat" in args else 5
+    print_report(run(max_mb, repeat))
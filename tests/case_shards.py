@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Behavioral test cases, sharded per skill under tests/cases/.
+
+Each skill owns one JSON shard, tests/cases/{skill-name}.json, holding its
+triggering cases, functional tests and the cross-skill routing prompts that
+should resolve to it:
+
+    {
+      "skill": "building-rag-pipeline",
+      "trigger": {"should_trigger": [...], "should_not_trigger": [...]},
+      "functional": [{"prompt": ..., "expected_steps": [...], ...}],
+      "ambiguous": [{"prompt": ..., "description": ..., "expected_top": ..., "should_be_ambiguous": false}]
+    }
+
+Prompts that belong to no single skill live in tests/cases/_shared.json.
+Shards are read lazily, only for the skills being validated.
+"""
+
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+CASES_DIR = Path(__file__).parent / "cases"
+SHARED_SHARD = "_shared"
+
+
+@dataclass
+class FunctionalTest:
+    skill: str
+    prompt: str
+    expected_steps: list = field(default_factory=list)  # step keywords that should appear
+    expected_references: list = field(default_factory=list)  # reference files that should be loaded
+    expected_artifact: str = ""  # artifact path pattern
+    expected_sections: list = field(default_factory=list)  # sections in output
+
+
+def shard_names(skills=None):
+    """Shard names to run: all of them, or those of `skills` (the shared shard only when unfiltered)."""
+    names = sorted(p.stem for p in CASES_DIR.glob("*.json"))
+    if skills is None:
+        return names
+    wanted = set(skills)
+    return [name for name in names if name in wanted]
+
+
+@lru_cache(maxsize=None)
+def load_shard(name):
+    """Parsed shard, with missing sections defaulted to empty."""
+    data = json.loads((CASES_DIR / f"{name}.json").read_text())
+    return {
+        "skill": data.get("skill"),
+        "trigger": data.get("trigger"),
+        "functional": [FunctionalTest(skill=name, **test) for test in data.get("functional", [])],
+        "ambiguous": data.get("ambiguous", []),
+    }
+
+
+def trigger_cases(skills=None):
+    """{skill: {"should_trigger": [...], "should_not_trigger": [...]}}, sorted by skill."""
+    cases = {}
+    for name in shard_names(skills):
+        shard = load_shard(name)
+        if shard["trigger"]:
+            cases[name] = shard["trigger"]
+    return cases
+
+
+def functional_tests(skills=None):
+    return [test for name in shard_names(skills) for test in load_shard(name)["functional"]]
+
+
+def ambiguous_prompts(skills=None):
+    return [case for name in shard_names(skills) for case in load_shard(name)["ambiguous"]]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Hierarchical vs flat routing on the behavioral suite's labeled cases.
+
+For each scorer (keyword, bm25) routes every built-in case flat and in the
+matching hierarchical mode, and reports top-1 accuracy, top-3 recall,
+ambiguity rate, skills scored per prompt, stage-one fallback rate and the
+prompts whose top-1 differs between the two.
+
+Run: python3 tests/compare_routers.py [--json]
+"""
+
+import json
+import sys
+
+from replay_prompts import ReplayStats, builtin_cases
+from skill_router import STAGE_ONE_FALLBACKS, make_ranker, make_staged_ranker
+
+PAIRS = (("keyword", "hierarchical"), ("bm25", "hierarchical-bm25"))
+
+
+def top1(routing):
+    return routing[0][0] if routing else None
+
+
+def compare(skills, cases, flat_mode, staged_mode):
+    """Summary of one flat/hierarchical pair over (prompt, expected) cases."""
+    flat_rank = make_ranker(skills, flat_mode)
+    staged_rank = make_staged_ranker(skills, staged_mode)
+    flat, staged = ReplayStats(), ReplayStats()
+    scored = 0
+    fallbacks_before = STAGE_ONE_FALLBACKS.value
+    changed = []
+    for prompt, expected in cases:
+        flat_routing = flat_rank(prompt)
+        staged_routing, n = staged_rank(prompt)
+        flat.add(flat_routing, expected)
+        staged.add(staged_routing, expected)
+        scored += n
+        if top1(flat_routing) != top1(staged_routing):
+            changed.append((prompt, expected, top1(flat_routing), top1(staged_routing)))
+    prompts = max(flat.prompts, 1)
+    return {
+        "flat": dict(flat.summary(), mode=flat_mode, skills_scored=len(skills)),
+        "hierarchical": dict(
+            staged.summary(),
+            mode=staged_mode,
+            skills_scored=scored / prompts,
+            fallback_rate=(STAGE_ONE_FALLBACKS.value - fallbacks_before) / prompts,
+        ),
+        "top1_changed": changed,
+    }
+
+
+def print_report(results):
+    print("=" * 72)
+    print("  AGENT SKILL KIT — HIERARCHICAL VS FLAT ROUTING (built-in cases)")
+    print("=" * 72)
+    rows = (
+        ("Top-1 accuracy", "top1_accuracy", "{:.1%}"),
+        ("Top-3 recall", "top3_recall", "{:.1%}"),
+        ("Ambiguity rate", "ambiguity_rate", "{:.1%}"),
+        ("Skills scored / prompt", "skills_scored", "{:.1f}"),
+    )
+    for result in results:
+        flat, staged = result["flat"], result["hierarchical"]
+        print(f"\n  {'':<24}{flat['mode']:>14}{staged['mode']:>20}{'diff':>10}")
+        for label, key, fmt in rows:
+            diff = staged[key] - flat[key]
+            print(f"  {label:<24}{fmt.format(flat[key]):>14}{fmt.format(staged[key]):>20}"
+                  f"{('+' if diff >= 0 else '') + fmt.format(diff):>10}")
+        print(f"  {'Stage-one fallbacks':<24}{'':>14}{staged['fallback_rate']:>20.1%}")
+        for prompt, expected, was, now in result["top1_changed"]:
+            print(f"    top-1 {was} -> {now} (expected {expected}): {prompt[:40]!r}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    from test_skills_behavioral import load_all_skills
+
+    skills = load_all_skills()
+    cases = list(builtin_cases())
+    results = [compare(skills, cases, flat, staged) for flat, staged in PAIRS]
+    if "--json" in sys.argv[1:]:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
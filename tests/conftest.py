@@ -0,0 +1,6 @@
+"""The suite scripts are collected through test_skill_checks.py, per check and skill."""
+
+from pytest_skillkit import routing_skills, skill_catalog  # noqa: F401 (session fixtures)
+
+# Script entry points: their test_* functions print and count instead of asserting
+collect_ignore = ["test_skills.py", "test_skills_behavioral.py"]
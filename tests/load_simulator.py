@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Progressive-disclosure load simulator.
+
+For every functional and triggering prompt in the case shards (tests/cases/),
+routes the prompt with the behavioral suite's router and follows the
+reference mentions of the winning skill, then reports which
+files would be pulled into context and what they cost in bytes and
+(estimated) tokens. References are followed the way the SKILL.md exposes
+them, so the numbers are the upper bound for a triggered skill.
+
+Run: python3 tests/load_simulator.py [--json] [--top N]
+"""
+
+import json
+import sys
+from collections import defaultdict
+
+from skill_catalog import load_catalog
+from reference_graph import extract_reference_mentions
+from case_shards import functional_tests, trigger_cases
+from skill_router import route_prompt
+from token_costs import count_tokens
+
+
+def skill_reference_files(source, skill, content):
+    """Existing reference files a SKILL.md points to, in first-mention order."""
+    files = []
+    for ref in dict.fromkeys(extract_reference_mentions(content, skill)):
+        for refs_dir in ("references", "reference"):
+            relpath = f"{skill}/{refs_dir}/{ref}"
+            if source.exists(relpath):
+                files.append(relpath)
+                break
+    return files
+
+
+def file_cost(source, relpath, part="body"):
+    return {
+        "path": relpath,
+        "bytes": source.size(relpath),
+        "tokens": count_tokens(source, relpath)[part],
+    }
+
+
+def collect_prompts():
+    """(source, expected skill, prompt) for every prompt the simulator replays.
+
+    "should not trigger" prompts have no expected skill; they still load whatever wins.
+    """
+    prompts = []
+    for test in functional_tests():
+        prompts.append(("functional", test.skill, test.prompt))
+    for skill_name, cases in trigger_cases().items():
+        for prompt in cases["should_trigger"]:
+            prompts.append(("trigger", skill_name, prompt))
+        for prompt in cases["should_not_trigger"]:
+            prompts.append(("non-trigger", None, prompt))
+    return prompts
+
+
+def simulate_prompt(prompt, catalog, skills):
+    """Files (with bytes/tokens) a prompt would load on top of the always-loaded metadata."""
+    routing = route_prompt(prompt, skills)
+    if not routing:
+        return {"skill": None, "files": [], "bytes": 0, "tokens": 0}
+    skill = routing[0][0]
+    source = catalog.source_for(skill)
+    refs = skill_reference_files(source, skill, skills[skill]["full_content"])
+    files = [file_cost(source, relpath) for relpath in [f"{skill}/SKILL.md"] + refs]
+    return {
+        "skill": skill,
+        "files": files,
+        "bytes": sum(f["bytes"] for f in files),
+        "tokens": sum(f["tokens"] for f in files),
+    }
+
+
+def simulate(prompts=None, roots=None):
+    """Per-prompt loads plus aggregates and worst offenders, over the merged catalog."""
+    prompts = collect_prompts() if prompts is None else prompts
+    with load_catalog(roots) as catalog:
+        skills = catalog.routing_skills()
+        metadata = [file_cost(catalog.source_for(name), f"{name}/SKILL.md", "frontmatter") for name in skills]
+        runs = []
+        for origin, expected, prompt in prompts:
+            run = simulate_prompt(prompt, catalog, skills)
+            run.update(source=origin, expected=expected, prompt=prompt)
+            runs.append(run)
+
+    file_drag = defaultdict(lambda: {"loads": 0, "tokens": 0})
+    for run in runs:
+        for f in run["files"]:
+            file_drag[f["path"]]["loads"] += 1
+            file_drag[f["path"]]["tokens"] += f["tokens"]
+
+    tokens = sorted(run["tokens"] for run in runs)
+    return {
+        "metadata_tokens": sum(m["tokens"] for m in metadata),
+        "runs": runs,
+        "aggregate": {
+            "prompts": len(runs),
+            "routed": sum(1 for run in runs if run["skill"]),
+            "misrouted": sum(1 for run in runs if run["expected"] and run["skill"] != run["expected"]),
+            "bytes_total": sum(run["bytes"] for run in runs),
+            "tokens_total": sum(tokens),
+            "tokens_p50": tokens[len(tokens) // 2] if tokens else 0,
+            "tokens_max": tokens[-1] if tokens else 0,
+        },
+        "files": dict(file_drag),
+    }
+
+
+def print_report(result, top=5):
+    agg = result["aggregate"]
+    print("=" * 72)
+    print("  AGENT SKILL KIT — CONTEXT LOAD SIMULATION")
+    print("=" * 72)
+    print(f"  Always-loaded metadata: ~{result['metadata_tokens']} tokens per prompt\n")
+    for run in result["runs"]:
+        skill = run["skill"] or "(no match)"
+        flag = f"  [expected {run['expected']}]" if run["expected"] and run["skill"] != run["expected"] else ""
+        print(f"  \"{run['prompt'][:48]}\"")
+        print(f"      -> {skill}: {len(run['files'])} files, {run['bytes'] / 1024:.1f} KB, ~{run['tokens']} tokens{flag}")
+
+    print("\n" + "-" * 72)
+    print(f"  Prompts: {agg['prompts']} ({agg['routed']} routed, {agg['misrouted']} labeled prompts misrouted)")
+    print(f"  On-trigger load: p50 ~{agg['tokens_p50']} tokens, max ~{agg['tokens_max']} tokens")
+    print(f"  Total across prompts: {agg['bytes_total'] / 1024:.1f} KB, ~{agg['tokens_total']} tokens")
+
+    print("\n  Worst prompts (by tokens loaded):")
+    for run in sorted(result["runs"], key=lambda r: -r["tokens"])[:top]:
+        print(f"    ~{run['tokens']:>7}  {run['skill']}  \"{run['prompt'][:40]}\"")
+    print("\n  Worst files (by tokens dragged in across prompts):")
+    for path, drag in sorted(result["files"].items(), key=lambda kv: -kv[1]["tokens"])[:top]:
+        print(f"    ~{drag['tokens']:>7}  {path} (loaded {drag['loads']}x)")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    top = int(args[args.index("--top") + 1]) if "--top" in args else 5
+    result = simulate()
+    if "--json" in args:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result, top)
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""Workflow-chain prefetch of skill files into a bounded in-memory cache.
+
+Sessions follow the README workflow chains (Greenfield A1 -> A2 -> A3 ...),
+so once a skill is routed the next one is predictable. After each
+activation, Prefetcher warms the SKILL.md and the most-used reference files
+of the likeliest next skills into a FileCache: an LRU over file bytes with
+a byte budget, keyed by (catalog root, path). Activations then read
+through the cache, and only misses go to the (possibly networked) root
+that provides the skill.
+
+Next skills are ranked by how often they follow the current skill across
+WORKFLOW_CHAINS; a chain whose previous step also matches the session's
+previous skill counts double. A skill's "most-used" references are the
+ones read most often by activations so far, then the ones its SKILL.md
+mentions most, in first-mention order.
+
+The report replays sessions (one per chain, each step a trigger prompt of
+that skill routed with route_prompt, plus shuffled control sessions)
+through several budgets, with and without prefetch, and prints demand
+hit rate, the share of reads served by prefetched entries, prefetch
+accuracy and cold reads. Once a budget holds most of the catalog, reuse
+across sessions dominates the hit rate for chains and controls alike; the
+prefetched share and accuracy are what tell them apart.
+
+Run: python3 tests/prefetch.py [--budget-kb N ...] [--json]
+"""
+
+import json
+import random
+import sys
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from reference_graph import extract_reference_mentions
+from routing_metrics import REGISTRY
+from skill_categories import SKILLS_BY_CODE
+
+WORKFLOW_CHAINS = {
+    "greenfield": ("A1", "A2", "A3", "B1", "B2", "B3", "C1", "D1"),
+    "eval-first": ("C2", "B3", "C1", "C3"),
+    "full-stack": ("B3", "B6", "B7", "D1", "D2"),
+    "existing-codebase": ("C3", "A2", "B3", "C1"),
+    "rag": ("A2", "B4", "B6", "C2", "D1"),
+}
+PREFETCH_BUDGET = 2 * 1024 * 1024  # bytes of file content kept in memory
+PREFETCH_FANOUT = 2  # next skills warmed after each activation
+PREFETCH_REFERENCES = 3  # reference files warmed per predicted skill
+
+READS = REGISTRY.counter("skill_prefetch_reads_total", "Skill file reads through the prefetch cache")
+PREFETCH_HITS = REGISTRY.counter("skill_prefetch_hits_total", "Reads served by a prefetched entry")
+COLD_READS = REGISTRY.counter("skill_prefetch_cold_reads_total", "Reads that went to the skill source")
+EVICTIONS = REGISTRY.counter("skill_prefetch_evictions_total", "Cache entries evicted for the byte budget")
+
+
+@dataclass
+class CacheStats:
+    reads: int = 0
+    hits: int = 0
+    prefetch_hits: int = 0  # hits on an entry warmed by prefetch and not read before
+    prefetched: int = 0  # entries inserted by prefetch
+    prefetch_unused: int = 0  # prefetched entries evicted before any read
+    evictions: int = 0
+
+    @property
+    def cold_reads(self):
+        return self.reads - self.hits
+
+    def summary(self):
+        def rate(n, d):
+            return n / d if d else 0.0
+
+        return {
+            "reads": self.reads,
+            "hit_rate": rate(self.hits, self.reads),
+            "prefetch_hit_rate": rate(self.prefetch_hits, self.reads),
+            "prefetch_accuracy": rate(self.prefetch_hits, self.prefetched),
+            "cold_reads": self.cold_reads,
+            "evictions": self.evictions,
+        }
+
+
+class FileCache:
+    """LRU cache of skill file bytes keyed by (root label, relpath), bounded by total size in bytes.
+
+    `sources` maps root labels to skill sources (a catalog's roots). Source
+    I/O never runs under the lock: a miss registers an in-flight fill, reads
+    the source unlocked and inserts under the lock. A read of a file that is
+    being filled (by a warm or another read) waits for that fill and counts
+    as a hit, so each file goes to the source once; reads of other files,
+    cached or not, never wait on it.
+    """
+
+    def __init__(self, sources, budget=PREFETCH_BUDGET):
+        self.sources = sources
+        self.budget = budget
+        self.size = 0
+        self.stats = CacheStats()
+        self._entries = OrderedDict()  # (root, relpath) -> [bytes, warmed by prefetch and unread]
+        self._fills = {}  # (root, relpath) -> Event set when its in-flight source read is done
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def read(self, key):
+        """File bytes, from memory when cached."""
+        with self._lock:
+            self.stats.reads += 1
+            READS.inc()
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    if entry[1]:
+                        entry[1] = False
+                        self.stats.prefetch_hits += 1
+                        PREFETCH_HITS.inc()
+                    return entry[0]
+                done = self._fills.get(key)
+                if done is None:
+                    done = self._fills[key] = threading.Event()
+                    break
+            done.wait()  # then take the filled entry; if the fill left none, fill it here
+        COLD_READS.inc()
+        return self._fill(key, done, prefetched=False)
+
+    def warm(self, key):
+        """Load a file ahead of use; a no-op if cached, being filled or larger than the budget."""
+        with self._lock:
+            if key in self._entries or key in self._fills:
+                return
+            done = self._fills[key] = threading.Event()
+        self._fill(key, done, prefetched=True)
+
+    def _fill(self, key, done, prefetched):
+        """Read a registered in-flight file from its source without the lock, insert it and release waiters."""
+        root, relpath = key
+        source = self.sources[root]
+        data = None
+        try:
+            if not prefetched or source.size(relpath) <= self.budget:
+                data = source.read_bytes(relpath)
+        finally:
+            with self._lock:
+                if data is not None:
+                    self._insert(key, data, prefetched)
+                del self._fills[key]
+            done.set()
+        return data
+
+    def _insert(self, key, data, prefetched):
+        """Add an entry and evict least recently used ones over the budget; caller holds the lock."""
+        if len(data) > self.budget:
+            return
+        self._entries[key] = [data, prefetched]
+        self.size += len(data)
+        if prefetched:
+            self.stats.prefetched += 1
+        while self.size > self.budget:
+            _, (old, unread) = self._entries.popitem(last=False)
+            self.size -= len(old)
+            self.stats.evictions += 1
+            self.stats.prefetch_unused += unread
+            EVICTIONS.inc()
+
+
+def chain_successors(chains=WORKFLOW_CHAINS):
+    """{skill: [(next skill, previous skill or None)]} for every step of every chain."""
+    successors = {}
+    for codes in chains.values():
+        skills = [SKILLS_BY_CODE[code] for code in codes]
+        for i, skill in enumerate(skills[:-1]):
+            successors.setdefault(skill, []).append((skills[i + 1], skills[i - 1] if i else None))
+    return successors
+
+
+def predict_next(history, successors, fanout=PREFETCH_FANOUT):
+    """Likeliest next skills after a session's routed skills, best first."""
+    if not history:
+        return []
+    current = history[-1]
+    previous = history[-2] if len(history) > 1 else None
+    votes = Counter()
+    for skill, before in successors.get(current, ()):
+        if skill not in history[-2:]:
+            votes[skill] += 2 if previous is not None and before == previous else 1
+    return [skill for skill, _ in votes.most_common(fanout)]
+
+
+class Prefetcher:
+    """Reads skill files through a FileCache and warms the likely next skills after each activation.
+
+    Files are (root label, relpath) keys resolved through the catalog, so
+    each skill is read from the root that provides it. With background=True,
+    warming runs on one worker thread so activations never wait for it;
+    usage counts and the mention cache are shared with that thread under a
+    lock that is never held across file I/O.
+    """
+
+    def __init__(self, catalog, skills, cache=None, fanout=PREFETCH_FANOUT,
+                 references=PREFETCH_REFERENCES, chains=WORKFLOW_CHAINS, background=False):
+        self.catalog = catalog
+        self.skills = skills
+        self.cache = FileCache({root.label: root.source for root in catalog.roots}) if cache is None else cache
+        self.fanout = fanout
+        self.references = references
+        self.successors = chain_successors(chains)
+        self.history = []
+        self.usage = Counter()  # (root, relpath) -> reads by activations
+        self._mentions = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1) if background else None
+
+    def skill_file(self, skill):
+        """(root, relpath) of a skill's SKILL.md."""
+        entry = self.catalog.skills[skill]
+        return entry.root, entry.relpath
+
+    def reference_files(self, skill):
+        """Existing reference files of a skill as (root, relpath), most-mentioned first (cached per skill)."""
+        with self._lock:
+            files = self._mentions.get(skill)
+        if files is None:
+            from load_simulator import skill_reference_files
+
+            # Reads the SKILL.md body and lists references/: outside the lock, so activations don't wait on it
+            root = self.catalog.skills[skill].root
+            content = self.skills[skill]["full_content"]
+            mentions = Counter(extract_reference_mentions(content, skill))
+            relpaths = skill_reference_files(self.catalog.source_for(skill), skill, content)
+            relpaths.sort(key=lambda relpath: -mentions[relpath.rsplit("/", 1)[1]])  # stable: first mention breaks ties
+            with self._lock:
+                files = self._mentions.setdefault(skill, [(root, relpath) for relpath in relpaths])
+        return list(files)
+
+    def prefetch_files(self, skill):
+        """SKILL.md plus the `references` most-used reference files of a skill."""
+        refs = self.reference_files(skill)
+        with self._lock:
+            refs.sort(key=lambda key: -self.usage[key])
+        return [self.skill_file(skill)] + refs[:self.references]
+
+    def activate(self, skill, files=None):
+        """Read a routed skill's files (SKILL.md and every reference by default), then prefetch."""
+        files = [self.skill_file(skill)] + self.reference_files(skill) if files is None else files
+        contents = [self.cache.read(key) for key in files]
+        with self._lock:
+            self.usage.update(files)
+        self.history.append(skill)
+        predicted = [s for s in predict_next(self.history, self.successors, self.fanout) if s in self.skills]
+        if self._executor is not None:
+            self._executor.submit(self._warm, predicted)
+        else:
+            self._warm(predicted)
+        return contents
+
+    def _warm(self, predicted):
+        for skill in predicted:
+            for key in self.prefetch_files(skill):
+                self.cache.warm(key)
+
+    def end_session(self):
+        self.history = []
+
+    def close(self):
+        """Wait for pending warms and stop the worker thread."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+def session_prompts(seed=0, shuffled=1):
+    """[(label, [(prompt, expected skill)])]: one session per chain, then shuffled controls."""
+    from case_shards import trigger_cases
+
+    cases = trigger_cases()
+    rng = random.Random(seed)
+    sessions = []
+    for name, codes in WORKFLOW_CHAINS.items():
+        steps = [SKILLS_BY_CODE[code] for code in codes]
+        sessions.append((name, [(rng.choice(cases[s]["should_trigger"]), s) for s in steps if s in cases]))
+    for i in range(shuffled):
+        for name, codes in WORKFLOW_CHAINS.items():
+            steps = [SKILLS_BY_CODE[code] for code in codes]
+            rng.shuffle(steps)
+            sessions.append((f"shuffled-{name}", [(rng.choice(cases[s]["should_trigger"]), s) for s in steps if s in cases]))
+    return sessions
+
+
+def replay_sessions(sessions, catalog, skills, budget, prefetch=True):
+    """Route each session's prompts and activate the top skill; returns CacheStats for the chain and control sessions."""
+    from skill_router import route_prompt
+
+    sources = {root.label: root.source for root in catalog.roots}
+    results = {}
+    for kind in ("chain", "shuffled"):
+        cache = FileCache(sources, budget)
+        prefetcher = Prefetcher(catalog, skills, cache, fanout=PREFETCH_FANOUT if prefetch else 0)
+        for label, steps in sessions:
+            if label.startswith("shuffled") != (kind == "shuffled"):
+                continue
+            for prompt, _ in steps:
+                routing = route_prompt(prompt, skills)
+                if routing:
+                    prefetcher.activate(routing[0][0])
+            prefetcher.end_session()
+        results[kind] = cache.stats.summary()
+    return results
+
+
+def run(budgets_kb, seed=0):
+    from skill_catalog import load_catalog
+
+    sessions = session_prompts(seed)
+    rows = []
+    with load_catalog() as catalog:
+        skills = catalog.routing_skills()
+        for budget_kb in budgets_kb:
+            for prefetch in (False, True):
+                result = replay_sessions(sessions, catalog, skills, budget_kb * 1024, prefetch)
+                rows.append({"budget_kb": budget_kb, "prefetch": prefetch, **result})
+    return rows
+
+
+def print_report(rows):
+    print("=" * 84)
+    print("  AGENT SKILL KIT — WORKFLOW-CHAIN PREFETCH (chain sessions / shuffled controls)")
+    print("=" * 84)
+    print(f"  {'budget':>9}  {'prefetch':<8}  {'hit rate':>15}  {'from prefetch':>15}  "
+          f"{'accuracy':>15}  {'cold reads':>11}")
+    for row in rows:
+        chain, shuffled = row["chain"], row["shuffled"]
+
+        def pair(key, fmt="{:.0%}"):
+            return f"{fmt.format(chain[key])} / {fmt.format(shuffled[key])}"
+
+        print(f"  {row['budget_kb']:>6} KB  {'on' if row['prefetch'] else 'off':<8}  {pair('hit_rate'):>15}  "
+              f"{pair('prefetch_hit_rate'):>15}  {pair('prefetch_accuracy'):>15}  {pair('cold_reads', '{}'):>11}")
+    print("=" * 84)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    budgets = [int(a) for i, a in enumerate(args) if i and args[i - 1] == "--budget-kb"] or [64, 256, 2048]
+    rows = run(budgets)
+    if "--json" in args:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_report(rows)
@@ -0,0 +1,54 @@
+"""pytest plugin for the skill suites: session fixtures and record outcomes.
+
+test_skills.py and test_skills_behavioral.py stay runnable as scripts; under
+pytest their checks run as the parametrized items of test_skill_checks.py,
+which turn each check's (status, msg) records into an outcome with
+check_records(): FAIL fails the item, WARN emits a SkillKitWarning, a check
+that examined the skill and found nothing wrong passes, and a check whose
+scope leaves the skill out (no records at all) is skipped.
+
+The catalog is a session fixture, so each process (each pytest-xdist
+worker) loads it once. Make warnings strict with
+`-W error::pytest_skillkit.SkillKitWarning`.
+"""
+
+import warnings
+
+import pytest
+
+
+class SkillKitWarning(UserWarning):
+    """A WARN record from a skill check."""
+
+
+def check_records(records):
+    """Fail, warn, pass or skip according to a check's (status, msg) records.
+
+    No records at all means the check never looked at the skill (out of its
+    scope), which skips; "info" records alone mean it looked and found
+    nothing to report, which passes.
+    """
+    if not records:
+        pytest.skip("check does not apply to this skill")
+    checked = [(status, msg) for status, msg in records if status != "info"]
+    for status, msg in checked:
+        if status == "warn":
+            warnings.warn(SkillKitWarning(msg), stacklevel=2)
+    failures = [msg for status, msg in checked if status == "fail"]
+    if failures:
+        pytest.fail("\n".join(failures), pytrace=False)
+
+
+@pytest.fixture(scope="session")
+def skill_catalog():
+    """The merged catalog of every configured skills root, loaded once per process."""
+    from skill_catalog import load_catalog
+
+    with load_catalog() as catalog:
+        yield catalog
+
+
+@pytest.fixture(scope="session")
+def routing_skills(skill_catalog):
+    """{name: {"description", "full_content"}} of the catalog, as the router reads it."""
+    return skill_catalog.routing_skills()
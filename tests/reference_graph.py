@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Reference graph analysis: dead references and cross-skill duplicates.
+
+Builds the graph of which SKILL.md (or reference file) mentions which
+references/*.md, then reports:
+  1. Dead references — files no SKILL.md reaches, directly or through
+     another reference. They are still copied on install.
+  2. Duplicates — identical files (content hash) and near-duplicates
+     (word-shingle Jaccard similarity, found with MinHash + LSH so the
+     catalog is never compared pairwise), which could be shared.
+
+Run: python3 tests/reference_graph.py
+"""
+
+import hashlib
+import re
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from skill_docs import cache_get, cache_put, scan_skill_doc
+from skill_source import as_skill_source, default_skill_source
+
+SHINGLE_WORDS = 5
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard almost always collide
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+# Known example-only mentions in Anthropic-installed skills (prose examples, not real refs)
+EXAMPLE_FILES = {
+    "creating-and-managing-skills": {"finance.md", "mnda.md", "policies.md", "api_docs.md", "schema.md"},
+}
+# extracting-patterns mentions other skills' references as integration examples
+CROSS_SKILL_REFS = {
+    "extracting-patterns": {"langgraph-patterns.md", "state-machine-patterns.md", "llm-mocking.md"},
+}
+# references/x.md, optionally qualified by the skill that owns it: other-skill/references/x.md
+MENTION_RE = re.compile(r"(?:([a-z0-9]+(?:-[a-z0-9]+)*)/)?references?/([a-zA-Z0-9_-]+\.md)")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass
+class ReferenceGraph:
+    files: list = field(default_factory=list)  # "skill/references/x.md", relative to the source
+    edges: dict = field(default_factory=lambda: defaultdict(set))  # source -> {file keys}
+    live: set = field(default_factory=set)
+
+    @property
+    def dead(self):
+        return sorted(set(self.files) - self.live)
+
+
+def excluded_mentions(skill):
+    """Reference names a skill mentions that are not its own files (prose examples, other skills')."""
+    return EXAMPLE_FILES.get(skill, set()) | CROSS_SKILL_REFS.get(skill, set())
+
+
+def extract_reference_mentions(content, skill_name):
+    """Find all references/*.md mentions in a SKILL.md file.
+
+    Filters out example references that point to OTHER skills' files,
+    and example file names used in documentation prose (e.g., finance.md, mnda.md).
+    """
+    # Matches like references/filename.md, reference/filename.md come from the shared scan
+    all_mentions = scan_skill_doc(content).reference_mentions
+    exclude = excluded_mentions(skill_name)
+    return [ref for ref in all_mentions if ref not in exclude]
+
+
+def build_reference_graph(source=None):
+    """Mention graph from every SKILL.md and reference file, with liveness.
+
+    A mention resolves within the mentioning skill, unless its path names
+    another skill (other-skill/references/x.md). Mentions listed in
+    EXAMPLE_FILES and CROSS_SKILL_REFS are not followed.
+    """
+    source = default_skill_source() if source is None else as_skill_source(source)
+    graph = ReferenceGraph()
+    by_skill = defaultdict(dict)  # skill -> {name: key}
+    roots = []
+    for skill in source.skill_names():
+        for refs_dir in ("references", "reference"):
+            for ref_name in source.list_files(f"{skill}/{refs_dir}"):
+                key = f"{skill}/{refs_dir}/{ref_name}"
+                graph.files.append(key)
+                by_skill[skill].setdefault(ref_name, key)
+        if source.exists(f"{skill}/SKILL.md"):
+            roots.append(f"{skill}/SKILL.md")
+
+    for key in roots + graph.files:
+        skill = key.split("/", 1)[0]
+        excluded = excluded_mentions(skill)
+        for owner, name in MENTION_RE.findall(source.read_text(key)):
+            if owner in by_skill and owner != skill:
+                target = by_skill[owner].get(name)
+            elif name in excluded:
+                continue
+            else:
+                target = by_skill[skill].get(name)
+            if target:
+                graph.edges[key].add(target)
+
+    # Liveness: everything reachable from a SKILL.md
+    stack = list(roots)
+    while stack:
+        for target in graph.edges.get(stack.pop(), ()):
+            if target not in graph.live:
+                graph.live.add(target)
+                stack.append(target)
+    return graph
+
+
+def shingles(text, k=SHINGLE_WORDS):
+    """Hashed k-word shingles of a text (lowercased, punctuation-insensitive)."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < k:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + k]).encode("utf-8")) for i in range(len(words) - k + 1)}
+
+
+def _permutations(n=MINHASH_PERMUTATIONS):
+    seeds = hashlib.sha256(b"agent-skill-kit-minhash").digest()
+    perms = []
+    for i in range(n):
+        digest = hashlib.sha256(seeds + i.to_bytes(2, "big")).digest()
+        a = int.from_bytes(digest[:8], "big") % _MERSENNE_PRIME or 1
+        b = int.from_bytes(digest[8:16], "big") % _MERSENNE_PRIME
+        perms.append((a, b))
+    return perms
+
+
+_PERMS = _permutations()
+
+
+def minhash(shingle_set):
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in shingle_set) for a, b in _PERMS)
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def find_duplicates(source, files, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """Exact and near-duplicate groups among files (relative paths) of a source.
+
+    Returns (exact, near): exact is a list of key groups with identical
+    bytes; near is a list of (key_a, key_b, similarity) above `threshold`,
+    excluding pairs already reported as exact.
+    """
+    by_hash = defaultdict(list)
+    texts = {}
+    digests = {}
+    for key in sorted(files):
+        data = source.read_bytes(key)
+        digest = hashlib.sha256(data).hexdigest()
+        by_hash[digest].append(key)
+        texts[key] = data.decode("utf-8", "replace")
+        digests[key] = digest
+    exact = [keys for keys in by_hash.values() if len(keys) > 1]
+    same_bytes = {frozenset((a, b)) for keys in exact for a in keys for b in keys if a != b}
+
+    # MinHash signatures are cached by content hash: only new or edited files are hashed
+    cache_key = hashlib.sha256(f"minhash:{source.cache_id('')}".encode("utf-8")).hexdigest()
+    cached = cache_get("minhash", cache_key) or {}
+    if cached.get("permutations") != MINHASH_PERMUTATIONS:
+        cached = {}
+    known = cached.get("signatures", {})
+    signatures = {}
+    for key, digest in digests.items():
+        if digest not in signatures:
+            signature = known.get(digest)
+            if signature is None:
+                shingle_set = shingles(texts[key])
+                signature = list(minhash(shingle_set)) if shingle_set else []
+            signatures[digest] = signature
+    if signatures.keys() != known.keys():
+        cache_put("minhash", cache_key, {"permutations": MINHASH_PERMUTATIONS, "signatures": signatures})
+
+    rows = MINHASH_PERMUTATIONS // LSH_BANDS
+    buckets = defaultdict(list)
+    for key, digest in digests.items():
+        signature = tuple(signatures[digest])
+        if not signature:
+            continue
+        for band in range(LSH_BANDS):
+            buckets[(band, signature[band * rows:(band + 1) * rows])].append(key)
+
+    candidates = set()
+    for keys in buckets.values():
+        for i, a in enumerate(keys):
+            for b in keys[i + 1:]:
+                pair = frozenset((a, b))
+                if pair not in same_bytes:
+                    candidates.add(tuple(sorted(pair)))
+
+    sets = {}
+    near = []
+    for a, b in sorted(candidates):
+        for key in (a, b):
+            if key not in sets:
+                sets[key] = shingles(texts[key])
+        similarity = jaccard(sets[a], sets[b])
+        if similarity >= threshold:
+            near.append((a, b, similarity))
+    return exact, near
+
+
+if __name__ == "__main__":
+    skills = default_skill_source()
+    graph = build_reference_graph(skills)
+    exact, near = find_duplicates(skills, graph.files)
+
+    print("=" * 60)
+    print("  AGENT SKILL KIT — REFERENCE GRAPH")
+    print("=" * 60)
+    total_bytes = sum(skills.size(k) for k in graph.files)
+    print(f"  {len(graph.files)} reference files, {total_bytes / 1024:.1f} KB")
+
+    dead = graph.dead
+    dead_bytes = sum(skills.size(k) for k in dead)
+    print(f"\n  Dead references ({len(dead)}, {dead_bytes / 1024:.1f} KB):")
+    for key in dead:
+        print(f"    {key}")
+
+    dup_bytes = sum(skills.size(k) for keys in exact for k in keys[1:])
+    print(f"\n  Identical files ({len(exact)} groups, {dup_bytes / 1024:.1f} KB redundant):")
+    for keys in exact:
+        print(f"    {' = '.join(keys)}")
+    print(f"\n  Near-duplicates (Jaccard >= {NEAR_DUPLICATE_THRESHOLD}):")
+    for a, b, similarity in near:
+        print(f"    {similarity:.2f}  {a} ~ {b}")
+    print("=" * 60)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Replay prompt logs through the router and measure routing quality.
+
+Streams JSONL prompt logs of any size through the router in constant
+memory: each line is scored as it is read against skill profiles (or a
+BM25 index) built once, and only running counters and a skills x skills
+confusion matrix are kept.
+
+Each line is a JSON object with a "prompt" and, optionally, the skill it
+should route to under "expected" (or "expected_skill"; null = unlabeled).
+Lines that are not objects with a string prompt are counted and skipped.
+
+Metrics (labeled prompts only, except ambiguity and no-match):
+  top-1 accuracy, top-3 recall, ambiguity rate (top two within the 0.15
+  margin), no-match rate, and the confusion matrix expected -> predicted.
+
+Run:
+  python3 tests/replay_prompts.py prompts.jsonl [more.jsonl ...] [--json] [--router MODE]
+  cat prompts.jsonl | python3 tests/replay_prompts.py -
+  python3 tests/replay_prompts.py --builtin     # the behavioral suite's cases (tests/cases/)
+"""
+
+import json
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+
+from skill_router import is_ambiguous, make_ranker, split_router_arg
+
+NO_MATCH = "(none)"
+
+
+@dataclass
+class ReplayStats:
+    """Incrementally updated routing-quality counters."""
+
+    prompts: int = 0
+    skipped: int = 0
+    labeled: int = 0
+    top1: int = 0
+    top3: int = 0
+    ambiguous: int = 0
+    no_match: int = 0
+    confusion: Counter = field(default_factory=Counter)  # (expected, predicted) -> count
+
+    def add(self, routing, expected=None):
+        self.prompts += 1
+        if not routing:
+            self.no_match += 1
+        elif is_ambiguous(routing):
+            self.ambiguous += 1
+        if expected is None:
+            return
+        self.labeled += 1
+        predicted = routing[0][0] if routing else NO_MATCH
+        self.confusion[(expected, predicted)] += 1
+        if predicted == expected:
+            self.top1 += 1
+        if expected in (name for name, _ in routing[:3]):
+            self.top3 += 1
+
+    def summary(self):
+        def rate(n, d):
+            return n / d if d else 0.0
+
+        return {
+            "prompts": self.prompts,
+            "skipped": self.skipped,
+            "labeled": self.labeled,
+            "top1_accuracy": rate(self.top1, self.labeled),
+            "top3_recall": rate(self.top3, self.labeled),
+            "ambiguity_rate": rate(self.ambiguous, self.prompts),
+            "no_match_rate": rate(self.no_match, self.prompts),
+        }
+
+    def top_confusions(self, n=10):
+        """Most frequent misroutes: [((expected, predicted), count)]."""
+        misses = [(pair, c) for pair, c in self.confusion.items() if pair[0] != pair[1]]
+        return sorted(misses, key=lambda item: (-item[1], item[0]))[:n]
+
+
+def parse_record(line):
+    """(prompt, expected) from a JSONL line, or None if the line is unusable."""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("prompt"), str):
+        return None
+    expected = record.get("expected", record.get("expected_skill"))
+    return record["prompt"], expected if isinstance(expected, str) else None
+
+
+def replay_lines(lines, rank, stats=None):
+    """Replay JSONL lines through `rank` (see make_ranker) into `stats` (a new ReplayStats by default)."""
+    stats = ReplayStats() if stats is None else stats
+    for line in lines:
+        parsed = parse_record(line)
+        if parsed is None:
+            if line.strip():
+                stats.skipped += 1
+            continue
+        prompt, expected = parsed
+        stats.add(rank(prompt), expected)
+    return stats
+
+
+def replay_cases(cases, rank, stats=None):
+    """Replay (prompt, expected) pairs into `stats`."""
+    stats = ReplayStats() if stats is None else stats
+    for prompt, expected in cases:
+        stats.add(rank(prompt), expected)
+    return stats
+
+
+def builtin_cases():
+    """Labeled (prompt, expected) pairs from the behavioral suite's test cases."""
+    from case_shards import ambiguous_prompts, trigger_cases
+
+    for skill_name, cases in trigger_cases().items():
+        for prompt in cases["should_trigger"]:
+            yield prompt, skill_name
+    for case in ambiguous_prompts():
+        yield case["prompt"], case["expected_top"]
+
+
+def print_report(stats, top=10):
+    summary = stats.summary()
+    print("=" * 60)
+    print("  AGENT SKILL KIT — PROMPT REPLAY")
+    print("=" * 60)
+    print(f"  Prompts: {summary['prompts']} ({summary['labeled']} labeled, {summary['skipped']} skipped lines)")
+    print(f"  Top-1 accuracy:  {summary['top1_accuracy']:.1%}")
+    print(f"  Top-3 recall:    {summary['top3_recall']:.1%}")
+    print(f"  Ambiguity rate:  {summary['ambiguity_rate']:.1%}")
+    print(f"  No-match rate:   {summary['no_match_rate']:.1%}")
+    confusions = stats.top_confusions(top)
+    if confusions:
+        print("\n  Most frequent misroutes (expected -> predicted):")
+        for (expected, predicted), count in confusions:
+            print(f"    {count:>7}  {expected} -> {predicted}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    from test_skills_behavioral import load_all_skills
+
+    mode, argv = split_router_arg(sys.argv[1:])
+    args = [a for a in argv if not a.startswith("--")]
+    flags = {a for a in argv if a.startswith("--")}
+    if not args and "--builtin" not in flags:
+        print(__doc__.split("Run:")[1].rstrip())
+        sys.exit(2)
+
+    rank = make_ranker(load_all_skills(), mode)
+    stats = ReplayStats()
+    if "--builtin" in flags:
+        replay_cases(builtin_cases(), rank, stats)
+    for path in args:
+        if path == "-":
+            replay_lines(sys.stdin, rank, stats)
+        else:
+            with open(path, encoding="utf-8") as f:
+                replay_lines(f, rank, stats)
+
+    if "--json" in flags:
+        summary = stats.summary()
+        summary["confusion"] = [[e, p, c] for (e, p), c in sorted(stats.confusion.items())]
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(stats)
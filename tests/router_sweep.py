@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Routing accuracy vs latency across router configurations.
+
+Runs every configuration over the same labeled cases (the behavioral
+suite's trigger and ambiguous cases, plus any JSONL corpora in the
+replay_prompts.py format) and reports top-1 accuracy, top-3 recall,
+ambiguity rate, p50/p99 per-prompt latency and peak memory (tracemalloc,
+profiles/indexes included). The configurations are:
+
+  mode      keyword, bm25, hierarchical, hierarchical-bm25 (stage-one pruning)
+  weights   TRIGGER_WEIGHT / TOPIC_WEIGHT pairs (keyword scorers only)
+  cutoff    MIN_SCORE values
+  caching   prebuilt  profiles/index built once (make_ranker)
+            per-call  route_prompt() per prompt: cached lookups plus metrics
+            cold      route_prompt() with every router cache cleared first
+
+The scorer reads its weights and cutoff from skill_router's module
+constants at call time, so a configuration applies them only for the
+duration of its run. The report is the Pareto frontier over top-1
+accuracy, top-3 recall and p50 latency, plus the fastest configuration
+that matches the default one on both accuracy metrics.
+
+Run: python3 tests/router_sweep.py [corpus.jsonl ...] [--no-builtin] [--repeat N] [--all] [--json]
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+import skill_router
+from replay_prompts import ReplayStats, builtin_cases, parse_record
+from skill_router import MIN_SCORE, ROUTER_MODES, TOPIC_WEIGHT, TRIGGER_WEIGHT, clear_caches, make_ranker, route_prompt
+
+WEIGHTINGS = ((3.0, 2.0), (2.0, 2.0), (4.0, 2.0), (3.0, 1.0), (3.0, 3.0))
+CUTOFFS = (0.0, 0.05, 0.1, 0.2)
+CACHING = ("prebuilt", "per-call", "cold")
+KEYWORD_MODES = ("keyword", "hierarchical")
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    mode: str = "keyword"
+    trigger_weight: float = TRIGGER_WEIGHT
+    topic_weight: float = TOPIC_WEIGHT
+    min_score: float = MIN_SCORE
+    caching: str = "prebuilt"
+
+    @property
+    def label(self):
+        weights = f" {self.trigger_weight:g}/{self.topic_weight:g}" if self.mode in KEYWORD_MODES else ""
+        return f"{self.mode}{weights} cut {self.min_score:g} {self.caching}"
+
+
+DEFAULT_CONFIG = SweepConfig()
+
+
+def sweep_configs():
+    """Weights x cutoffs per mode with prebuilt profiles, then each mode's other caching options."""
+    configs = []
+    for mode in ROUTER_MODES:
+        for trigger, topic in WEIGHTINGS if mode in KEYWORD_MODES else ((TRIGGER_WEIGHT, TOPIC_WEIGHT),):
+            for cutoff in CUTOFFS:
+                configs.append(SweepConfig(mode, trigger, topic, cutoff))
+    for mode in ROUTER_MODES:
+        for caching in CACHING[1:]:
+            configs.append(SweepConfig(mode, caching=caching))
+    return configs
+
+
+@contextmanager
+def applied(config):
+    """skill_router's scorer constants set to a configuration's, restored on exit."""
+    values = {"TRIGGER_WEIGHT": config.trigger_weight, "TOPIC_WEIGHT": config.topic_weight, "MIN_SCORE": config.min_score}
+    saved = {name: getattr(skill_router, name) for name in values}
+    for name, value in values.items():
+        setattr(skill_router, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(skill_router, name, value)
+
+
+def build_ranker(config, skills):
+    """prompt -> [(skill, score)] for a configuration's mode and caching."""
+    if config.caching == "prebuilt":
+        return make_ranker(skills, config.mode)
+    if config.caching == "per-call":
+        return lambda prompt: route_prompt(prompt, skills, mode=config.mode)
+
+    def cold(prompt):
+        clear_caches()
+        return route_prompt(prompt, skills, mode=config.mode)
+    return cold
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))] if sorted_values else 0.0
+
+
+def first_pass(config, skills, cases):
+    """(ranker, ReplayStats, peak bytes) of a configuration's first, memory-traced pass over the cases."""
+    with applied(config):
+        clear_caches()
+        tracemalloc.start()
+        rank = build_ranker(config, skills)
+        stats = ReplayStats()
+        for prompt, expected in cases:
+            stats.add(rank(prompt), expected)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return rank, stats, peak
+
+
+def timed_pass(config, rank, cases, timings):
+    """Append one untraced pass's per-prompt latencies to `timings`."""
+    with applied(config):
+        gc.disable()  # collections triggered by other configurations' garbage skew p99
+        try:
+            for prompt, _ in cases:
+                started = time.perf_counter()
+                rank(prompt)
+                timings.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+
+
+def result_row(config, stats, peak, timings):
+    timings = sorted(timings)
+    summary = stats.summary()
+    return {
+        "config": asdict(config),
+        "label": config.label,
+        "top1_accuracy": summary["top1_accuracy"],
+        "top3_recall": summary["top3_recall"],
+        "ambiguity_rate": summary["ambiguity_rate"],
+        "p50_us": percentile(timings, 0.50) * 1e6,
+        "p99_us": percentile(timings, 0.99) * 1e6,
+        "peak_kb": peak / 1024,
+    }
+
+
+def dominates(a, b):
+    """a is at least as good as b on top-1, top-3 and p50, and better on one of them."""
+    at_least = (a["top1_accuracy"] >= b["top1_accuracy"] and a["top3_recall"] >= b["top3_recall"]
+                and a["p50_us"] <= b["p50_us"])
+    better = (a["top1_accuracy"] > b["top1_accuracy"] or a["top3_recall"] > b["top3_recall"]
+              or a["p50_us"] < b["p50_us"])
+    return at_least and better
+
+
+def pareto_frontier(rows):
+    """Rows no other row dominates, fastest first."""
+    frontier = [row for row in rows if not any(dominates(other, row) for other in rows)]
+    return sorted(frontier, key=lambda row: row["p50_us"])
+
+
+def fastest_without_loss(rows, baseline):
+    """The fastest row with top-1 and top-3 at least the baseline's."""
+    keep = [row for row in rows if row["top1_accuracy"] >= baseline["top1_accuracy"]
+            and row["top3_recall"] >= baseline["top3_recall"]]
+    return min(keep, key=lambda row: row["p50_us"]) if keep else None
+
+
+def load_cases(paths, builtin=True):
+    cases = list(builtin_cases()) if builtin else []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            cases.extend(parsed for parsed in map(parse_record, f) if parsed is not None)
+    return cases
+
+
+def sweep(skills, cases, configs=None, repeat=5):
+    """Rows per configuration; timed passes go round-robin over configurations so drift hits all alike."""
+    configs = sweep_configs() if configs is None else configs
+    firsts = [first_pass(config, skills, cases) for config in configs]
+    timings = [[] for _ in configs]
+    for _ in range(repeat):
+        for config, (rank, _, _), config_timings in zip(configs, firsts, timings):
+            timed_pass(config, rank, cases, config_timings)
+    rows = [result_row(config, stats, peak, t) for config, (_, stats, peak), t in zip(configs, firsts, timings)]
+    baseline = next(row for row, config in zip(rows, configs) if config == DEFAULT_CONFIG)
+    return {
+        "cases": len(cases),
+        "rows": rows,
+        "frontier": pareto_frontier(rows),
+        "baseline": baseline,
+        "recommended": fastest_without_loss(rows, baseline),
+    }
+
+
+def print_report(result, show_all=False):
+    print("=" * 96)
+    print(f"  AGENT SKILL KIT — ROUTER SWEEP ({len(result['rows'])} configurations, {result['cases']} cases)")
+    print("=" * 96)
+    print(f"  {'configuration':<44} {'top-1':>7} {'top-3':>7} {'ambig':>7} {'p50 us':>8} {'p99 us':>8} {'peak KB':>9}")
+    frontier = {row["label"] for row in result["frontier"]}
+    rows = sorted(result["rows"], key=lambda row: row["p50_us"]) if show_all else result["frontier"]
+    for row in rows:
+        mark = "*" if row["label"] in frontier else " "
+        print(f" {mark}{row['label']:<44} {row['top1_accuracy']:>7.1%} {row['top3_recall']:>7.1%} "
+              f"{row['ambiguity_rate']:>7.1%} {row['p50_us']:>8.1f} {row['p99_us']:>8.1f} {row['peak_kb']:>9.1f}")
+    print("-" * 96)
+    baseline, recommended = result["baseline"], result["recommended"]
+    print(f"  Default: {baseline['label']} — top-1 {baseline['top1_accuracy']:.1%}, "
+          f"top-3 {baseline['top3_recall']:.1%}, p50 {baseline['p50_us']:.1f} us")
+    if recommended is not None:
+        print(f"  Fastest without losing top-1/top-3: {recommended['label']} — top-1 "
+              f"{recommended['top1_accuracy']:.1%}, top-3 {recommended['top3_recall']:.1%}, "
+              f"p50 {recommended['p50_us']:.1f} us")
+    print("  (* = Pareto frontier over top-1, top-3 and p50 latency)")
+    print("=" * 96)
+
+
+if __name__ == "__main__":
+    from test_skills_behavioral import load_all_skills
+
+    args = sys.argv[1:]
+    repeat = int(args[args.index("--repeat") + 1]) if "--repeat" in args else 5
+    paths = [a for i, a in enumerate(args) if not a.startswith("--") and (i == 0 or args[i - 1] != "--repeat")]
+    result = sweep(load_all_skills(), load_cases(paths, "--no-builtin" not in args), repeat=repeat)
+    if "--json" in args:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result, "--all" in args)
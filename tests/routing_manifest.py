@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Compact routing manifest generated from SKILL.md frontmatter.
+
+.claude/skills/ROUTING_MANIFEST.json holds, per skill, everything the
+keyword router reads from a description, so routing consumers can load one
+small file instead of opening every SKILL.md:
+
+    {
+      "version": 1,
+      "hash": "<sha256 over every skill's name and hash>",
+      "skills": [
+        {"name": ..., "description": "<first sentence: what it does>",
+         "triggers": [...], "exclusions": [...], "hash": "<sha256 of these routing fields>"}
+      ]
+    }
+
+Drift between the manifest and the skills is a comparison of the top-level
+hash (and per-skill hashes to say which skill moved). A skill's hash covers
+only the fields above, so editing a SKILL.md body leaves the manifest
+current; only a change to what the router reads makes it stale.
+
+Run: python3 tests/routing_manifest.py [--write | --check]
+"""
+
+import hashlib
+import json
+import re
+import sys
+
+from skill_catalog import load_catalog
+from skill_router import EXCLUSION_RE, TERM_RE, SkillProfile
+from skill_source import default_skill_source
+
+MANIFEST_NAME = "ROUTING_MANIFEST.json"
+MANIFEST_VERSION = 2
+EXCLUSION_SPLIT_RE = re.compile(r",\s*(?:or\s+|and\s+)?|\s+or\s+|\s+and\s+", re.IGNORECASE)
+CATALOG_ENTRY_RE = re.compile(r"[*`\[]*([a-z0-9]+(?:-[a-z0-9]+)*)[*`\]]*(?:\([^)]*\))?")
+CATALOG_NAME_HEADERS = ("skill", "skills", "name", "skill name")
+
+
+def trim_description(description):
+    """The router's topic text: the first sentence, or the first 100 characters."""
+    text = description.split(".")[0] if "." in description else description[:100]
+    return " ".join(text.split())
+
+
+def split_exclusions(description):
+    """Items of the "Do NOT use for ..." clause, e.g. ["RAG pipelines", "architecture design"]."""
+    match = EXCLUSION_RE.search(description.lower())
+    if not match:
+        return []
+    start, end = match.span(1)
+    clause = " ".join(description[start:end].split())
+    return [item.strip() for item in EXCLUSION_SPLIT_RE.split(clause) if item.strip()]
+
+
+def routing_hash(entry):
+    """sha256 of a manifest entry's routing fields (everything but its hash)."""
+    fields = {key: value for key, value in entry.items() if key != "hash"}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def manifest_digest(entries):
+    h = hashlib.sha256()
+    for entry in entries:
+        h.update(f"{entry['name']}\0{entry['hash']}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def build_manifest(source=None):
+    """Manifest for a skill source (the default source by default), skills sorted by name."""
+    source = default_skill_source() if source is None else source
+    with load_catalog([("source", source)]) as catalog:
+        skills = catalog.skills
+    entries = [
+        {
+            "name": entry.name,
+            "description": trim_description(entry.description),
+            "triggers": entry.triggers,
+            "exclusions": split_exclusions(entry.description),
+        }
+        for entry in sorted(skills.values(), key=lambda e: e.name)
+    ]
+    for entry in entries:
+        entry["hash"] = routing_hash(entry)
+    return {"version": MANIFEST_VERSION, "hash": manifest_digest(entries), "skills": entries}
+
+
+def read_manifest(source):
+    """The manifest stored in a source, or None if missing or unreadable."""
+    if not source.exists(MANIFEST_NAME):
+        return None
+    try:
+        manifest = json.loads(source.read_text(MANIFEST_NAME))
+    except ValueError:
+        return None
+    return manifest if isinstance(manifest, dict) and manifest.get("version") == MANIFEST_VERSION else None
+
+
+def write_manifest(source=None):
+    """Regenerate the manifest of a directory source; returns it."""
+    source = default_skill_source() if source is None else source
+    path = source.local_path(MANIFEST_NAME)
+    if path is None:
+        raise ValueError(f"{source.label} is read-only; build the manifest before bundling")
+    manifest = build_manifest(source)
+    path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+def manifest_drift(stored, current):
+    """Skill names added, removed or changed between two manifests."""
+    old = {e["name"]: e["hash"] for e in stored["skills"]}
+    new = {e["name"]: e["hash"] for e in current["skills"]}
+    return {
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+        "changed": sorted(name for name in old.keys() & new.keys() if old[name] != new[name]),
+    }
+
+
+def catalog_skill_names(catalog_text):
+    """Skill names SKILL_CATALOG.md lists, in order.
+
+    Only tables count: the name column is the first whose header is one of
+    CATALOG_NAME_HEADERS, and each row's cell there must be exactly a skill
+    name, optionally bold, backticked or linked. Tables without such a
+    column, bullets and headings are ignored.
+    """
+    names = []
+    column = None  # name column of the current table; None outside a skill table
+    header = True  # the next table row is a header
+    for line in catalog_text.splitlines():
+        stripped = line.strip()
+        if not stripped.startswith("|"):
+            column, header = None, True
+            continue
+        cells = [cell.strip() for cell in stripped.strip("|").split("|")]
+        if header:
+            labels = [cell.strip("*`").lower() for cell in cells]
+            column = next((i for i, label in enumerate(labels) if label in CATALOG_NAME_HEADERS), None)
+            header = False
+            continue
+        if column is None or column >= len(cells):
+            continue
+        match = CATALOG_ENTRY_RE.fullmatch(cells[column])
+        if match and match.group(1) not in names:
+            names.append(match.group(1))
+    return names
+
+
+def manifest_profiles(manifest):
+    """Router profiles built from a manifest alone, equal to build_profile() on each SKILL.md."""
+    return [
+        SkillProfile(
+            name=entry["name"],
+            triggers=tuple(entry["triggers"]),
+            exclusion_words=frozenset(TERM_RE.findall(" ".join(entry["exclusions"]).lower())),
+            key_terms=frozenset(TERM_RE.findall(entry["description"].lower())),
+        )
+        for entry in manifest["skills"]
+    ]
+
+
+if __name__ == "__main__":
+    skills = default_skill_source()
+    if "--write" in sys.argv[1:]:
+        manifest = write_manifest(skills)
+        print(f"Wrote {MANIFEST_NAME}: {len(manifest['skills'])} skills, hash {manifest['hash'][:12]}")
+    elif "--check" in sys.argv[1:]:
+        stored = read_manifest(skills)
+        if stored is None:
+            print(f"{MANIFEST_NAME} missing; run: python3 tests/routing_manifest.py --write")
+            sys.exit(1)
+        drift = manifest_drift(stored, build_manifest(skills))
+        if any(drift.values()):
+            print(f"{MANIFEST_NAME} is stale: " + ", ".join(f"{k} {v}" for k, v in drift.items() if v))
+            sys.exit(1)
+        print(f"{MANIFEST_NAME} is current")
+    else:
+        print(json.dumps(build_manifest(skills), indent=2))
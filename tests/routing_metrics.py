@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""In-process metrics for routing and catalog loading.
+
+route_prompt(), load_catalog() and the prefetch cache record into the
+module-level REGISTRY:
+
+  skill_router_routes_total               prompts routed
+  skill_router_route_seconds              routing latency (histogram)
+  skill_router_skills_scored_total        skill profiles scored
+  skill_router_skills_pruned_total        scored skills at or below MIN_SCORE
+  skill_router_candidates                 skills above MIN_SCORE per prompt (histogram)
+  skill_router_profile_cache_hit_ratio    build_profile() cache hits / lookups
+  skill_router_stage_one_fallbacks_total  hierarchical prompts scored against every skill
+  skill_catalog_load_seconds              load_catalog() time (histogram)
+  skill_catalog_skills                    routable skills in the last catalog loaded
+  skill_catalog_roots                     roots in the last catalog loaded
+  skill_catalog_index_cache_hits_total    root indexes served from cache
+  skill_catalog_index_cache_misses_total  root indexes rebuilt
+  skill_prefetch_reads_total              skill file reads through prefetch.FileCache
+  skill_prefetch_hits_total               reads served by a prefetched entry
+  skill_prefetch_cold_reads_total         reads that went to the skill source
+  skill_prefetch_evictions_total          cache entries evicted for the byte budget
+
+REGISTRY.dump(path) writes JSON for *.json paths and Prometheus text
+otherwise. With SKILL_KIT_METRICS=path set, the registry is also dumped
+when the process exits.
+
+Run: python3 tests/routing_metrics.py [--json] [--out FILE]   # metrics for the built-in cases
+"""
+
+import atexit
+import json
+import math
+import os
+import sys
+import threading
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (25e-6, 50e-6, 100e-6, 250e-6, 500e-6, 1e-3, 2.5e-3, 10e-3, 50e-3)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20)
+LOAD_BUCKETS = (1e-3, 5e-3, 25e-3, 100e-3, 500e-3, 2.5)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self):
+        return [(self.name, "", self.value)]
+
+    def to_dict(self):
+        return self.value
+
+
+class Gauge:
+    """A set value, or one computed at dump time when created with `fn`."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, fn=None):
+        self.name = name
+        self.help = help_text
+        self._value = 0
+        self._fn = fn
+
+    def set(self, value):
+        self._value = value
+
+    @property
+    def value(self):
+        return self._fn() if self._fn is not None else self._value
+
+    def samples(self):
+        return [(self.name, "", self.value)]
+
+    def to_dict(self):
+        return self.value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot: above the highest bound
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self):
+        samples = []
+        cumulative = 0
+        for bound, n in zip(self.buckets + (math.inf,), self.counts):
+            cumulative += n
+            le = "+Inf" if bound == math.inf else repr(bound)
+            samples.append((f"{self.name}_bucket", f'{{le="{le}"}}', cumulative))
+        samples.append((f"{self.name}_sum", "", self.sum))
+        samples.append((f"{self.name}_count", "", self.count))
+        return samples
+
+    def to_dict(self):
+        """Per-bucket (not cumulative) counts, keyed by upper bound."""
+        return {
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+
+    def _register(self, metric):
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text):
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name, help_text, fn=None):
+        return self._register(Gauge(name, help_text, fn))
+
+    def histogram(self, name, help_text, buckets):
+        return self._register(Histogram(name, help_text, buckets))
+
+    def to_prometheus(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self):
+        return {name: metric.to_dict() for name, metric in self.metrics.items()}
+
+    def dump(self, path):
+        """Write the registry to `path`: JSON for *.json, Prometheus text otherwise."""
+        text = json.dumps(self.to_dict(), indent=2) if str(path).endswith(".json") else self.to_prometheus()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+REGISTRY = MetricsRegistry()
+
+# Run as a script, this file is __main__ and the router records into the
+# imported routing_metrics module's registry instead; only that one dumps.
+if os.environ.get("SKILL_KIT_METRICS") and __name__ != "__main__":
+    atexit.register(REGISTRY.dump, os.environ["SKILL_KIT_METRICS"])
+
+
+if __name__ == "__main__":
+    from replay_prompts import builtin_cases
+    from routing_metrics import REGISTRY as registry
+    from skill_router import route_prompt
+    from test_skills_behavioral import load_all_skills
+
+    args = sys.argv[1:]
+    skills = load_all_skills()
+    for prompt, _ in builtin_cases():
+        route_prompt(prompt, skills)
+    if "--out" in args:
+        registry.dump(args[args.index("--out") + 1])
+    elif "--json" in args:
+        print(json.dumps(registry.to_dict(), indent=2))
+    else:
+        print(registry.to_prometheus(), end="")
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Persisted prompts x skills score matrix with incremental re-scoring.
+
+A prompt's score against one skill depends only on that skill's
+description, so editing a description changes a single column of the
+matrix. The matrix for a prompt corpus is kept in .skill-cache/matrix/:
+
+  {corpus}.json     metadata: skill order, description hash per column
+  {corpus}.scores   array('d'), column-major (one contiguous column per skill)
+  {corpus}.top3     array('i'), row-major, 3 skill indices per prompt (-1 = none)
+
+On the next run only columns whose description hash changed (or new
+skills) are re-scored. Rankings are recomputed only for prompts the
+changed columns can affect: a prompt is untouched when the edited skill
+was not in its top 3 before and does not reach its third score now.
+Prompts whose top-1 or top-3 routing changed are reported.
+
+A matrix is tied to its corpus by a digest of the prompts, the scorer
+constants and skill_router.SCORER_VERSION, so a scorer change rebuilds it
+from scratch instead of mixing old and new columns.
+
+Run:
+  python3 tests/score_matrix.py prompts.jsonl [--json]
+  python3 tests/score_matrix.py --builtin         # the behavioral suite's cases
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from array import array
+from dataclasses import dataclass, field
+
+from replay_prompts import builtin_cases, parse_record
+from skill_docs import CACHE_DIR, cache_get, cache_put
+from skill_router import (
+    MIN_SCORE,
+    PROMPT_POLICY,
+    SCORER_VERSION,
+    TOPIC_TERMS_CAP,
+    TOPIC_WEIGHT,
+    TRIGGER_WEIGHT,
+    build_profiles,
+    prompt_terms,
+    score_profile,
+    window_prompt,
+)
+
+MATRIX_VERSION = 1
+TOP_K = 3
+NO_SKILL = -1
+SCORER_PARAMS = [SCORER_VERSION, TRIGGER_WEIGHT, TOPIC_WEIGHT, TOPIC_TERMS_CAP, MIN_SCORE, repr(PROMPT_POLICY)]
+
+
+@dataclass
+class ScoreMatrix:
+    skills: list = field(default_factory=list)  # skill names, column order = routing order
+    hashes: list = field(default_factory=list)  # description sha256 per column
+    prompts: int = 0
+    scores: array = field(default_factory=lambda: array("d"))  # column-major
+    top3: array = field(default_factory=lambda: array("i"))  # row-major, TOP_K per prompt
+
+    def column(self, j):
+        return self.scores[j * self.prompts:(j + 1) * self.prompts]
+
+    def score(self, i, j):
+        return self.scores[j * self.prompts + i]
+
+    def top(self, i):
+        """[(skill, score)] top-3 for prompt i, as rank_profiles() would return it."""
+        row = self.top3[i * TOP_K:(i + 1) * TOP_K]
+        return [(self.skills[j], self.score(i, j)) for j in row if j != NO_SKILL]
+
+
+def description_hash(description):
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+def corpus_digest(prompts):
+    h = hashlib.sha256(json.dumps(SCORER_PARAMS).encode("utf-8"))
+    for prompt in prompts:
+        h.update(prompt.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def read_corpus(paths):
+    """Prompts from JSONL files (or "-" for stdin), unusable lines skipped."""
+    prompts = []
+    for path in paths:
+        f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        with f:
+            for line in f:
+                parsed = parse_record(line)
+                if parsed is not None:
+                    prompts.append(parsed[0])
+    return prompts
+
+
+def score_column(prepared, profile):
+    return array("d", (score_profile(lower, terms, profile) for lower, terms in prepared))
+
+
+def rank_row(matrix, i):
+    """Top-3 column indices of prompt i above MIN_SCORE (ties keep column order)."""
+    n = matrix.prompts
+    row = [(matrix.scores[j * n + i], j) for j in range(len(matrix.skills))]
+    ranked = sorted((pair for pair in row if pair[0] > MIN_SCORE), key=lambda pair: -pair[0])
+    top = [j for _, j in ranked[:TOP_K]]
+    return top + [NO_SKILL] * (TOP_K - len(top))
+
+
+def update_matrix(matrix, prompts, skills):
+    """Bring `matrix` (or None) up to date with `skills`; returns (matrix, rescored, changed).
+
+    `rescored` lists the skills whose columns were recomputed; `changed` is
+    [(prompt index, old top-3, new top-3)] for prompts whose top-3 moved.
+    A matrix built from scratch reports no changes.
+    """
+    n = len(prompts)
+    profiles = build_profiles(skills)
+    names = [p.name for p in profiles]
+    hashes = [description_hash(data["description"]) for data in skills.values()]
+    prepared = None
+
+    old_cols = {}
+    if matrix is not None and matrix.prompts == n:
+        old_cols = {(name, h): j for j, (name, h) in enumerate(zip(matrix.skills, matrix.hashes))}
+
+    new = ScoreMatrix(skills=names, hashes=hashes, prompts=n)
+    rescored = []
+    for profile, h in zip(profiles, hashes):
+        j = old_cols.get((profile.name, h))
+        if j is not None:
+            new.scores.extend(matrix.column(j))
+            continue
+        if prepared is None:
+            prepared = [(lower, prompt_terms(lower)) for lower in map(window_prompt, prompts)]
+        new.scores.extend(score_column(prepared, profile))
+        rescored.append(profile.name)
+
+    if not old_cols:
+        for i in range(n):
+            new.top3.extend(rank_row(new, i))
+        return new, rescored, []
+
+    if names != matrix.skills:
+        # Columns moved: every ranking has to be recomputed from the matrix
+        candidates = range(n)
+    else:
+        changed_cols = [names.index(name) for name in rescored]
+        candidates = [i for i in range(n) if _may_change(matrix, new, i, changed_cols)]
+
+    new.top3 = array("i", matrix.top3) if names == matrix.skills else array("i", [NO_SKILL] * (n * TOP_K))
+    changed = []
+    for i in candidates:
+        old_top = matrix.top(i)
+        new.top3[i * TOP_K:(i + 1) * TOP_K] = array("i", rank_row(new, i))
+        new_top = new.top(i)
+        if [s for s, _ in old_top] != [s for s, _ in new_top]:
+            changed.append((i, old_top, new_top))
+    return new, rescored, changed
+
+
+def _may_change(old, new, i, changed_cols):
+    """False when no changed column was or can become part of prompt i's top 3."""
+    row = old.top3[i * TOP_K:(i + 1) * TOP_K]
+    full = row[-1] != NO_SKILL
+    threshold = old.score(i, row[-1]) if full else MIN_SCORE
+    for j in changed_cols:
+        if j in row:
+            return True
+        s = new.score(i, j)
+        if s > MIN_SCORE and (not full or s >= threshold):
+            return True
+    return False
+
+
+def _blob_path(digest, ext):
+    return CACHE_DIR / "matrix" / f"{digest}.{ext}"
+
+
+def load_matrix(digest):
+    """Cached matrix for a corpus digest, or None if absent or inconsistent."""
+    meta = cache_get("matrix", digest)
+    if not meta or meta.get("version") != MATRIX_VERSION:
+        return None
+    matrix = ScoreMatrix(skills=meta["skills"], hashes=meta["hashes"], prompts=meta["prompts"])
+    try:
+        with open(_blob_path(digest, "scores"), "rb") as f:
+            matrix.scores.frombytes(f.read())
+        with open(_blob_path(digest, "top3"), "rb") as f:
+            matrix.top3.frombytes(f.read())
+    except (OSError, ValueError):
+        return None
+    if len(matrix.scores) != matrix.prompts * len(matrix.skills) or len(matrix.top3) != matrix.prompts * TOP_K:
+        return None
+    return matrix
+
+
+def save_matrix(matrix, digest):
+    """Persist blobs first, then the metadata that vouches for them (best-effort)."""
+    try:
+        _blob_path(digest, "json").unlink(missing_ok=True)
+        for ext, data in (("scores", matrix.scores), ("top3", matrix.top3)):
+            path = _blob_path(digest, ext)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                data.tofile(f)
+            os.replace(tmp, path)
+    except OSError:
+        return
+    cache_put("matrix", digest, {
+        "version": MATRIX_VERSION,
+        "skills": matrix.skills,
+        "hashes": matrix.hashes,
+        "prompts": matrix.prompts,
+    })
+
+
+def _top1(routing):
+    return routing[0][0] if routing else None
+
+
+def rescore(prompts, skills):
+    """Load, incrementally update and persist the matrix for a prompt corpus."""
+    digest = corpus_digest(prompts)
+    started = time.perf_counter()
+    cached = load_matrix(digest)
+    matrix, rescored, changed = update_matrix(cached, prompts, skills)
+    elapsed = time.perf_counter() - started
+    if rescored or cached is None or cached.skills != matrix.skills:
+        save_matrix(matrix, digest)
+    return {
+        "prompts": len(prompts),
+        "skills": len(matrix.skills),
+        "rescored": rescored,
+        "seconds": elapsed,
+        "changed": [
+            {
+                "prompt": prompts[i],
+                "top1_changed": _top1(old) != _top1(new),
+                "old": [name for name, _ in old],
+                "new": [name for name, _ in new],
+            }
+            for i, old, new in changed
+        ],
+    }
+
+
+def print_report(result, top=20):
+    print("=" * 72)
+    print("  AGENT SKILL KIT — INCREMENTAL SCORE MATRIX")
+    print("=" * 72)
+    print(f"  {result['prompts']} prompts x {result['skills']} skills in {result['seconds']:.2f}s")
+    if len(result["rescored"]) == result["skills"]:
+        rescored = f"all {result['skills']} (new matrix)"
+    else:
+        rescored = ", ".join(result["rescored"]) or "none (matrix up to date)"
+    print(f"  Re-scored columns: {rescored}")
+    changed = result["changed"]
+    top1 = sum(1 for c in changed if c["top1_changed"])
+    print(f"  Routing changed: {top1} top-1, {len(changed)} top-3")
+    for c in changed[:top]:
+        flag = "top-1" if c["top1_changed"] else "top-3"
+        print(f"    [{flag}] \"{c['prompt'][:48]}\"")
+        print(f"        {' > '.join(c['old']) or '(none)'}  ->  {' > '.join(c['new']) or '(none)'}")
+    if len(changed) > top:
+        print(f"    ... {len(changed) - top} more (use --json for all)")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    from test_skills_behavioral import load_all_skills
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = {a for a in sys.argv[1:] if a.startswith("--")}
+    if not args and "--builtin" not in flags:
+        print(__doc__.split("Run:")[1].rstrip())
+        sys.exit(2)
+
+    prompts = [prompt for prompt, _ in builtin_cases()] if "--builtin" in flags else []
+    prompts += read_corpus(args)
+    result = rescore(prompts, load_all_skills())
+    if "--json" in flags:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Packed single-file skill bundles (.skillpack).
+
+A bundle holds every file of a skills directory (SKILL.md files,
+references, scripts, assets, SKILL_CATALOG.md) in one file; dotfiles and
+dot-directories are left out. It is a ZIP archive: each entry is deflated
+on its own and the central directory at the end of the file is the index,
+so any single reference can be read without unpacking the rest. Entries
+are written in sorted order with fixed timestamps, so rebuilding an
+unchanged catalog produces a byte-identical bundle.
+
+SkillBundle implements the same source interface as
+skill_source.DirectorySource, so validators and the router read bundles
+directly (SKILL_KIT_SOURCE=path/to/skills.skillpack). `unpack` restores
+the directory, file modes included, and refuses entries that would land
+outside the destination.
+
+Run:
+  python3 tests/skill_bundle.py build [SKILLS_DIR] OUT.skillpack
+  python3 tests/skill_bundle.py ls BUNDLE
+  python3 tests/skill_bundle.py cat BUNDLE skill/references/file.md
+  python3 tests/skill_bundle.py unpack BUNDLE DEST_DIR
+"""
+
+import sys
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from skill_source import SKILLS_DIR
+
+BUNDLE_COMMENT = b"agent-skill-kit bundle v1"
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def bundle_entries(skills_dir):
+    """(relpath, Path) for every non-hidden file under a skills directory, sorted."""
+    root = Path(skills_dir)
+    entries = []
+    for path in root.rglob("*"):
+        rel = path.relative_to(root)
+        if path.is_file() and not any(part.startswith(".") for part in rel.parts):
+            entries.append((rel.as_posix(), path))
+    return sorted(entries)
+
+
+def build_bundle(skills_dir, out_path, compresslevel=9):
+    """Pack a skills directory into a bundle. Returns the number of entries."""
+    entries = bundle_entries(skills_dir)
+    out_path = Path(out_path)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+        zf.comment = BUNDLE_COMMENT
+        for rel, path in entries:
+            info = zipfile.ZipInfo(rel, date_time=FIXED_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = (0o755 if path.stat().st_mode & 0o111 else 0o644) << 16
+            zf.writestr(info, path.read_bytes(), compresslevel=compresslevel)
+    tmp.replace(out_path)
+    return len(entries)
+
+
+class SkillBundle:
+    """Random-access reader for a .skillpack; a drop-in skill source."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.label = str(self.path)
+        self._zip = zipfile.ZipFile(self.path)
+        self._index = {info.filename: info for info in self._zip.infolist() if not info.is_dir()}
+        self._dirs = set()
+        for name in self._index:
+            parent = PurePosixPath(name).parent
+            while str(parent) != ".":
+                self._dirs.add(str(parent))
+                parent = parent.parent
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def names(self):
+        return sorted(self._index)
+
+    def skill_names(self):
+        return sorted(d for d in self._dirs if "/" not in d and not d.startswith("."))
+
+    def list_files(self, reldir, suffix=".md"):
+        prefix = reldir.rstrip("/") + "/"
+        return sorted(
+            name[len(prefix):]
+            for name in self._index
+            if name.startswith(prefix) and "/" not in name[len(prefix):] and name.endswith(suffix)
+        )
+
+    def exists(self, relpath):
+        return relpath in self._index or relpath.rstrip("/") in self._dirs
+
+    def is_dir(self, relpath):
+        return relpath.rstrip("/") in self._dirs
+
+    def read_bytes(self, relpath):
+        try:
+            return self._zip.read(self._index[relpath])
+        except KeyError:
+            raise FileNotFoundError(f"{self.path}!{relpath}") from None
+
+    def read_text(self, relpath):
+        return self.read_bytes(relpath).decode("utf-8")
+
+    def size(self, relpath):
+        return self._index[relpath].file_size
+
+    def fingerprint(self, relpath):
+        info = self._index[relpath]
+        return info.CRC, info.file_size
+
+    def cache_id(self, relpath):
+        return f"{self.path.resolve()}!{relpath}"
+
+    def local_path(self, relpath):
+        return None
+
+    def unpack(self, dest):
+        """Write every entry back out as a skills directory.
+
+        Raises ValueError, before writing anything, if an entry name is
+        absolute or resolves outside `dest`.
+        """
+        root = Path(dest).resolve()
+        targets = []
+        for name in self.names():
+            target = (root / name).resolve()
+            if PurePosixPath(name).is_absolute() or not target.is_relative_to(root):
+                raise ValueError(f"{self.path}: entry {name!r} would unpack outside {root}")
+            targets.append((name, target))
+        for name, target in targets:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(self.read_bytes(name))
+            target.chmod(0o755 if (self._index[name].external_attr >> 16) & 0o111 else 0o644)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args or args[0] not in {"build", "ls", "cat", "unpack"}:
+        print(__doc__.split("Run:")[1].rstrip())
+        sys.exit(2)
+    command, rest = args[0], args[1:]
+    if command == "build":
+        src, out = (rest[0], rest[1]) if len(rest) == 2 else (SKILLS_DIR, rest[0])
+        count = build_bundle(src, out)
+        print(f"Packed {count} files from {src} into {out} ({Path(out).stat().st_size / 1024:.1f} KB)")
+    elif command == "ls":
+        with SkillBundle(rest[0]) as bundle:
+            for name in bundle.names():
+                print(f"{bundle.size(name):>9}  {name}")
+    elif command == "cat":
+        with SkillBundle(rest[0]) as bundle:
+            sys.stdout.write(bundle.read_text(rest[1]))
+    elif command == "unpack":
+        with SkillBundle(rest[0]) as bundle:
+            bundle.unpack(rest[1])
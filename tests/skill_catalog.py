@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Merged multi-root skill catalog.
+
+Claude Code reads skills from several places at once: the project's
+`.claude/skills/`, the personal `~/.claude/skills/`, and any `--add-dir`
+directories. This module merges any number of such roots (directories or
+.skillpack bundles) into one routing index, in one pass, with explicit
+precedence: the first root that defines a skill name wins, and the others
+are reported as shadowed. Skills from different roots that share a quoted
+trigger phrase are reported as trigger collisions.
+
+Each root is indexed separately and the per-root index is cached in memory
+and in .skill-cache/, keyed by the root's file fingerprints, so when one
+root changes only that root is re-read.
+
+Roots come from SKILL_KIT_ROOTS (os.pathsep-separated, highest precedence
+first, each entry `path` or `label=path`); without it the catalog is the
+single source the suites validate (SKILL_KIT_SOURCE or .claude/skills/).
+A catalog owns the sources it opened from paths: close it (or use it as a
+context manager) once its routing records are no longer read.
+
+Run: python3 tests/skill_catalog.py [ROOT ...]
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from routing_metrics import LOAD_BUCKETS, REGISTRY
+from skill_docs import cache_get, cache_put
+from skill_source import as_skill_source, default_skill_source
+
+CATALOG_INDEX_VERSION = 2
+FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---", re.DOTALL)
+TRIGGER_PHRASE_RE = re.compile(r'"([^"]+)"')
+
+LOAD_SECONDS = REGISTRY.histogram("skill_catalog_load_seconds", "load_catalog time", LOAD_BUCKETS)
+CATALOG_SKILLS = REGISTRY.gauge("skill_catalog_skills", "Routable skills in the last catalog loaded")
+CATALOG_ROOTS = REGISTRY.gauge("skill_catalog_roots", "Roots in the last catalog loaded")
+INDEX_HITS = REGISTRY.counter("skill_catalog_index_cache_hits_total", "Root indexes served from cache")
+INDEX_MISSES = REGISTRY.counter("skill_catalog_index_cache_misses_total", "Root indexes rebuilt")
+
+
+@dataclass
+class SkillEntry:
+    name: str
+    root: str  # label of the root that defines it
+    relpath: str  # SKILL.md path inside that root
+    description: str
+    content_hash: str
+    triggers: list = field(default_factory=list)
+    category: str = ""  # frontmatter `category`, if any
+
+
+@dataclass
+class RootIndex:
+    label: str
+    source: object
+    entries: dict = field(default_factory=dict)  # name -> SkillEntry
+    from_cache: bool = False
+
+
+@dataclass
+class SkillCatalog:
+    roots: list = field(default_factory=list)  # RootIndex, highest precedence first
+    skills: dict = field(default_factory=dict)  # name -> winning SkillEntry
+    shadowed: list = field(default_factory=list)  # (winner, loser) SkillEntry pairs
+    trigger_collisions: dict = field(default_factory=dict)  # trigger -> [SkillEntry]
+    opened: list = field(default_factory=list)  # sources load_catalog opened from paths
+
+    def close(self):
+        """Close the sources this catalog opened; lazy records can no longer load after this."""
+        for source in self.opened:
+            source.close()
+        self.opened = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def conflicts(self):
+        """Shadowed pairs whose SKILL.md content actually differs."""
+        return [(w, l) for w, l in self.shadowed if w.content_hash != l.content_hash]
+
+    def source_for(self, name):
+        """Source of the root that provides skill `name`."""
+        label = self.skills[name].root
+        return next(root.source for root in self.roots if root.label == label)
+
+    def routing_skills(self, lazy=True):
+        """{name: {"description", "category", "full_content"}} as used by route_prompt().
+
+        With lazy=True, full_content is read from the winning root when first
+        accessed, so the catalog must stay open until then; lazy=False reads
+        every body now.
+        """
+        sources = {root.label: root.source for root in self.roots}
+        records = {
+            name: SkillRecord(sources[entry.root], entry.relpath, entry.description, entry.category)
+            for name, entry in self.skills.items()
+        }
+        if not lazy:
+            for record in records.values():
+                record.full_content
+        return records
+
+
+class SkillRecord(Mapping):
+    """Read-only routing record {"description", "category", "full_content"}; the SKILL.md body loads on first access.
+
+    Membership and iteration never load the body; record["full_content"]
+    and record.get("full_content") do.
+    """
+
+    KEYS = ("description", "category", "full_content")
+
+    def __init__(self, source, relpath, description, category=""):
+        self.description = description
+        self.category = category
+        self._source = source
+        self._relpath = relpath
+        self._content = None
+
+    @property
+    def full_content(self):
+        # Not cached_property: before Python 3.12 it holds one lock for every record while loading
+        if self._content is None:
+            self._content = self._source.read_text(self._relpath)
+        return self._content
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.KEYS
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f"SkillRecord({self._relpath!r}, description={self.description!r})"
+
+
+_frontmatter = {}  # frontmatter block sha256 -> parsed dict or None, for this process
+
+
+def parse_frontmatter(content):
+    """YAML frontmatter of a SKILL.md as a dict, or None if missing/invalid.
+
+    Parsed blocks are cached in .skill-cache/ by content hash, so PyYAML is
+    only imported when a block has not been seen before.
+    """
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        return None
+    block = match.group(1)
+    digest = hashlib.sha256(block.encode("utf-8")).hexdigest()
+    if digest not in _frontmatter:
+        record = cache_get("frontmatter", digest)
+        if record is None:
+            record = {"frontmatter": _load_yaml(block)}
+            try:
+                json.dumps(record)
+            except (TypeError, ValueError):
+                pass  # e.g. YAML dates: parse again next time instead of caching
+            else:
+                cache_put("frontmatter", digest, record)
+        _frontmatter[digest] = record["frontmatter"]
+    fm = _frontmatter[digest]
+    return dict(fm) if fm is not None else None
+
+
+def _load_yaml(block):
+    import yaml  # deferred: only needed on a frontmatter cache miss
+
+    try:
+        fm = yaml.safe_load(block)
+    except yaml.YAMLError:
+        return None
+    return fm if isinstance(fm, dict) else None
+
+
+def _root_fingerprint(source):
+    return [
+        [name, list(source.fingerprint(f"{name}/SKILL.md"))]
+        for name in source.skill_names()
+        if source.exists(f"{name}/SKILL.md")
+    ]
+
+
+_root_indexes = {}  # (root cache id, fingerprint) -> entries, for this process
+
+
+def index_root(source, label):
+    """Index one root: every skill's description, triggers, category and content hash."""
+    root_id = source.cache_id("")
+    fingerprint = _root_fingerprint(source)
+    memo_key = (root_id, repr(fingerprint))
+    if memo_key in _root_indexes:
+        entries = _root_indexes[memo_key]
+        return RootIndex(label, source, _relabel(entries, label), from_cache=True)
+
+    cache_key = hashlib.sha256(root_id.encode("utf-8")).hexdigest()
+    record = cache_get("catalog", cache_key)
+    if record and record.get("version") == CATALOG_INDEX_VERSION and record.get("fingerprint") == fingerprint:
+        entries = {e["name"]: SkillEntry(**e) for e in record["entries"]}
+        from_cache = True
+    else:
+        entries = {}
+        for name, _ in fingerprint:
+            relpath = f"{name}/SKILL.md"
+            content = source.read_text(relpath)
+            fm = parse_frontmatter(content)
+            if fm is None:
+                continue
+            description = str(fm.get("description", ""))
+            entries[name] = SkillEntry(
+                name=name,
+                root=label,
+                relpath=relpath,
+                description=description,
+                content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+                triggers=TRIGGER_PHRASE_RE.findall(description.lower()),
+                category=str(fm.get("category") or ""),
+            )
+        cache_put("catalog", cache_key, {
+            "version": CATALOG_INDEX_VERSION,
+            "fingerprint": fingerprint,
+            "entries": [vars(e) for e in entries.values()],
+        })
+        from_cache = False
+    _root_indexes[memo_key] = entries
+    return RootIndex(label, source, _relabel(entries, label), from_cache=from_cache)
+
+
+def _relabel(entries, label):
+    return {name: SkillEntry(**{**vars(e), "root": label}) for name, e in entries.items()}
+
+
+def parse_roots(spec):
+    """[(label, location)] from a SKILL_KIT_ROOTS-style string."""
+    roots = []
+    for i, item in enumerate(filter(None, spec.split(os.pathsep))):
+        label, sep, location = item.partition("=")
+        if not sep:
+            label, location = f"root{i + 1}", item
+        roots.append((label, location))
+    return roots
+
+
+def default_roots():
+    """Roots from $SKILL_KIT_ROOTS, else the single default skill source."""
+    spec = os.environ.get("SKILL_KIT_ROOTS")
+    if spec:
+        return parse_roots(spec)
+    return [("project", default_skill_source())]
+
+
+def load_catalog(roots=None):
+    """Merge roots [(label, directory | bundle | source)] into one catalog."""
+    started = time.perf_counter()
+    roots = default_roots() if roots is None else roots
+    catalog = SkillCatalog()
+    trigger_owners = defaultdict(list)
+    for label, location in roots:
+        source = as_skill_source(location)
+        if source is not location:
+            catalog.opened.append(source)
+        root = index_root(source, label)
+        (INDEX_HITS if root.from_cache else INDEX_MISSES).inc()
+        catalog.roots.append(root)
+        for name, entry in root.entries.items():
+            winner = catalog.skills.get(name)
+            if winner is not None:
+                catalog.shadowed.append((winner, entry))
+                continue
+            catalog.skills[name] = entry
+            for trigger in entry.triggers:
+                trigger_owners[trigger].append(entry)
+    catalog.trigger_collisions = {
+        trigger: owners
+        for trigger, owners in sorted(trigger_owners.items())
+        if len({e.root for e in owners}) > 1
+    }
+    LOAD_SECONDS.observe(time.perf_counter() - started)
+    CATALOG_SKILLS.set(len(catalog.skills))
+    CATALOG_ROOTS.set(len(catalog.roots))
+    return catalog
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    catalog = load_catalog(parse_roots(os.pathsep.join(args)) if args else None)
+    catalog.close()
+    print("=" * 60)
+    print("  AGENT SKILL KIT — MERGED CATALOG")
+    print("=" * 60)
+    for root in catalog.roots:
+        cached = " (cached index)" if root.from_cache else ""
+        print(f"  [{root.label}] {root.source.label}: {len(root.entries)} skills{cached}")
+    print(f"\n  {len(catalog.skills)} skills routable")
+    conflicts = catalog.conflicts
+    for winner, loser in catalog.shadowed:
+        kind = "CONFLICT" if (winner, loser) in conflicts else "shadowed"
+        print(f"  {kind}: {winner.name} from [{loser.root}] hidden by [{winner.root}]")
+    for trigger, owners in catalog.trigger_collisions.items():
+        who = ", ".join(f"{e.name} [{e.root}]" for e in owners)
+        print(f"  trigger collision: \"{trigger}\" -> {who}")
+    print("=" * 60)
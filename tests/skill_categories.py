@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Lifecycle categories and skill codes, as laid out in the README catalog.
+
+Skills are grouped A-F and numbered within their group in README order,
+giving the codes used by the workflow chains (A1 = researching-ai-topics,
+B3 = building-agent-core, ...). Skills not listed here (other roots,
+other teams) can declare one with a frontmatter `category`; the
+hierarchical router places the rest by description, and only what fits
+nowhere falls into OTHER_CATEGORY.
+"""
+
+CATEGORIES = {
+    "A": ("Research & Design", ("researching-ai-topics", "designing-agent-system", "planning-and-breaking-down")),
+    "B": ("Build", (
+        "setting-up-ai-dev-env",
+        "scaffolding-ai-project",
+        "building-agent-core",
+        "building-rag-pipeline",
+        "building-mcp-server",
+        "building-backend-api",
+        "building-ai-frontend",
+    )),
+    "C": ("Test & Evaluate", ("testing-ai-systems", "evaluating-and-benchmarking", "reviewing-ai-code")),
+    "D": ("Deploy & Observe", ("deploying-ai-systems", "instrumenting-observability")),
+    "E": ("Document", ("documenting-ai-systems",)),
+    "F": ("Meta", ("creating-and-managing-skills", "extracting-patterns")),
+}
+OTHER_CATEGORY = "other"
+
+SKILL_CODES = {
+    skill: f"{letter}{i}"
+    for letter, (_, skills) in CATEGORIES.items()
+    for i, skill in enumerate(skills, 1)
+}
+SKILLS_BY_CODE = {code: skill for skill, code in SKILL_CODES.items()}
+
+
+def skill_category(name, declared=None):
+    """Category letter of a skill, or OTHER_CATEGORY.
+
+    `declared` is the skill's frontmatter `category`, a letter or a title
+    in any case ("B", "build"); when it names a category it wins over the
+    README listing.
+    """
+    if declared:
+        value = str(declared).strip().lower()
+        for letter, (title, _) in CATEGORIES.items():
+            if value in (letter.lower(), title.lower()):
+                return letter
+    code = SKILL_CODES.get(name)
+    return code[0] if code else OTHER_CATEGORY
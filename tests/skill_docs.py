@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""Single-pass Markdown scanner for SKILL.md content metrics.
+
+The line-level content checks in test_skills.py and
+test_skills_behavioral.py (checklists, reference mentions, artifact paths,
+instruction depth) read their facts from one SkillDocStats record instead
+of running their own regexes over the file. Records are cached by content, so a file is tokenized once
+no matter how many checks consume it.
+
+SKILL.md and reference files can also be parsed into a section tree
+(headings with byte ranges, code and list blocks), which the structure
+checks (workflow steps, output sections) read. Trees are persisted in a
+content-hash-keyed cache so unchanged files are never re-parsed.
+
+Reference files are checked for stubs with a byte-level scanner that
+never decodes them and stops as soon as the answer is known.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get("SKILL_KIT_CACHE_DIR", Path(__file__).parent.parent / ".skill-cache"))
+SECTION_TREE_VERSION = 2
+
+# Line-level patterns, applied once per line during the scan
+CODE_FENCE_OPEN_RE = re.compile(r"```\w*$")
+CHECKLIST_RE = re.compile(r"\[([ x])\]")
+VERIFICATION_RE = re.compile(r"verify|checklist|validation", re.IGNORECASE)
+REF_ROUTING_RE = re.compile(r"(?:read|load|see).*reference", re.IGNORECASE)
+REFERENCE_MENTION_RE = re.compile(r"(?:references?)/([a-zA-Z0-9_-]+\.md)")
+ARTIFACT_PATH_RE = re.compile(r"\.claude/artifacts/[^\s`'\")\]]*")
+
+# Prefixes that do not count as instruction lines
+NON_CONTENT_PREFIXES = ("#", "---", "name:", "description:")
+
+
+@dataclass
+class SkillDocStats:
+    """Content metrics for one SKILL.md, produced by scan_skill_doc().
+
+    Structure (headings, workflow steps, code blocks) comes from the
+    section tree instead; see section_tree().
+    """
+
+    checklist_items: list = field(default_factory=list)  # (checked, text, line_no)
+    reference_mentions: list = field(default_factory=list)  # raw, in document order
+    artifact_paths: list = field(default_factory=list)
+    content_lines: int = 0
+    ref_routing_lines: int = 0
+    has_code_fence: bool = False
+    has_verification_keyword: bool = False
+    mentions_artifact: bool = False
+
+    @property
+    def instruction_lines(self):
+        """Content lines that are not just 'read the reference' routing."""
+        return self.content_lines - self.ref_routing_lines
+
+    @property
+    def has_checklist(self):
+        return bool(self.checklist_items) or self.has_verification_keyword
+
+
+@lru_cache(maxsize=256)
+def scan_skill_doc(content):
+    """Tokenize SKILL.md content in one pass over its lines."""
+    stats = SkillDocStats()
+    lines = content.split("\n")
+
+    for line_no, line in enumerate(lines, 1):
+        stripped = line.strip()
+
+        if not stats.has_code_fence and CODE_FENCE_OPEN_RE.search(line) and line_no < len(lines):
+            stats.has_code_fence = True
+
+        if stripped and not stripped.startswith(NON_CONTENT_PREFIXES):
+            stats.content_lines += 1
+
+        if "[" in line:
+            for box in CHECKLIST_RE.finditer(line):
+                text = line[box.end():].strip()
+                stats.checklist_items.append((box.group(1) == "x", text, line_no))
+
+        lowered = line.lower()
+        if "reference" in lowered:
+            stats.reference_mentions.extend(REFERENCE_MENTION_RE.findall(line))
+            if REF_ROUTING_RE.search(line):
+                stats.ref_routing_lines += 1
+        if not stats.has_verification_keyword and VERIFICATION_RE.search(line):
+            stats.has_verification_keyword = True
+        if "artifact" in lowered:
+            stats.mentions_artifact = True
+            stats.artifact_paths.extend(ARTIFACT_PATH_RE.findall(line))
+
+    return stats
+
+
+# ============================================================
+# SECTION TREE
+# ============================================================
+
+TREE_FENCE_RE = re.compile(rb"^\s*(```+|~~~+)\s*([\w+-]*)")
+# "###1. Gather" (no space) is a step heading too, as the original ###\s* check allowed
+TREE_HEADING_RE = re.compile(rb"^(#{1,6})(?:\s+|(?<=###)(?=\d))(.*?)\s*#*\s*$")
+LIST_ITEM_RE = re.compile(rb"^\s*(?:([-*+])|(\d+)[.)])\s+(\*\*)?")
+STEP_TITLE_RE = re.compile(r"(Step\s+)?\d+")
+WORKFLOW_TITLE_RE = re.compile(r"\w+.*(?:Workflow|Instructions|Process|Flow)")
+
+
+@dataclass
+class Block:
+    """A fenced code block or a run of list items inside a section."""
+
+    kind: str  # "code" or "list"
+    start: int  # byte offset of the first line
+    end: int  # byte offset just past the last line
+    info: str = ""  # code: fence language; list: "ordered-bold" if any item is, else the first item's "bullet"/"ordered"
+    headings: list = field(default_factory=list)  # headings inside code (output templates)
+
+
+@dataclass
+class Section:
+    """A heading and everything up to the next heading of the same or higher level."""
+
+    level: int  # 0 for the document root
+    title: str
+    start: int  # byte offset of the heading line
+    end: int  # byte offset where the section stops
+    body_start: int  # byte offset just past the heading line
+    blocks: list = field(default_factory=list)
+    children: list = field(default_factory=list)
+
+    @property
+    def size(self):
+        return self.end - self.start
+
+    def iter_sections(self):
+        """Yield this section and all descendants, depth-first in document order."""
+        yield self
+        for child in self.children:
+            yield from child.iter_sections()
+
+    def iter_blocks(self):
+        for section in self.iter_sections():
+            yield from section.blocks
+
+    def find(self, title):
+        """First section whose title contains `title` (case-insensitive), or None."""
+        needle = title.lower()
+        for section in self.iter_sections():
+            if section.level and needle in section.title.lower():
+                return section
+        return None
+
+    def has_heading(self, title, include_templates=True):
+        """True if a heading (or a heading inside an output template block) contains `title`."""
+        if self.find(title) is not None:
+            return True
+        if include_templates:
+            needle = title.lower()
+            return any(needle in h.lower() for block in self.iter_blocks() for h in block.headings)
+        return False
+
+    def has_numbered_workflow(self):
+        """Step headings (### Step N, ### N.), a workflow heading, or a numbered bold list."""
+        for section in self.iter_sections():
+            if section.level >= 3 and STEP_TITLE_RE.match(section.title):
+                return True
+            if 1 <= section.level <= 3 and WORKFLOW_TITLE_RE.match(section.title):
+                return True
+        return any(b.kind == "list" and b.info == "ordered-bold" for b in self.iter_blocks())
+
+    def to_dict(self):
+        return {
+            "level": self.level,
+            "title": self.title,
+            "start": self.start,
+            "end": self.end,
+            "body_start": self.body_start,
+            "blocks": [[b.kind, b.start, b.end, b.info, b.headings] for b in self.blocks],
+            "children": [c.to_dict() for c in self.children],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            level=data["level"],
+            title=data["title"],
+            start=data["start"],
+            end=data["end"],
+            body_start=data["body_start"],
+            blocks=[Block(*b) for b in data["blocks"]],
+            children=[cls.from_dict(c) for c in data["children"]],
+        )
+
+
+def parse_section_tree(data):
+    """Parse Markdown bytes into a Section tree rooted at a level-0 document node."""
+    root = Section(level=0, title="", start=0, end=len(data), body_start=0)
+    stack = [root]
+    code = None  # open code Block and its fence marker
+    listing = None  # open list Block
+    offset = 0
+
+    lines = data.split(b"\n")
+    # Skip YAML frontmatter so comments in it are not mistaken for headings
+    if lines and lines[0].rstrip() == b"---":
+        for i in range(1, len(lines)):
+            if lines[i].rstrip() == b"---":
+                offset = sum(len(l) + 1 for l in lines[: i + 1])
+                lines = lines[i + 1:]
+                break
+
+    for line in lines:
+        line_end = min(offset + len(line) + 1, len(data))
+
+        if code is not None:
+            block, marker = code
+            fence = TREE_FENCE_RE.match(line)
+            if fence and fence.group(1).startswith(marker) and not fence.group(2):
+                block.end = line_end
+                code = None
+            else:
+                heading = TREE_HEADING_RE.match(line)
+                if heading:
+                    block.headings.append(heading.group(2).decode("utf-8", "replace"))
+            offset = line_end
+            continue
+
+        item = LIST_ITEM_RE.match(line)
+        if listing is not None and (item or (line[:1] in (b" ", b"\t") and line.strip())):
+            listing.end = line_end
+            if item and _list_info(item) == "ordered-bold":
+                listing.info = "ordered-bold"
+            offset = line_end
+            continue
+        listing = None
+
+        fence = TREE_FENCE_RE.match(line)
+        heading = TREE_HEADING_RE.match(line)
+        if fence:
+            block = Block("code", offset, line_end, fence.group(2).decode("utf-8", "replace"))
+            stack[-1].blocks.append(block)
+            code = (block, fence.group(1))
+        elif heading:
+            level = len(heading.group(1))
+            while stack[-1].level >= level:
+                stack.pop().end = offset
+            section = Section(
+                level=level,
+                title=heading.group(2).decode("utf-8", "replace"),
+                start=offset,
+                end=len(data),
+                body_start=line_end,
+            )
+            stack[-1].children.append(section)
+            stack.append(section)
+        elif item:
+            listing = Block("list", offset, line_end, _list_info(item))
+            stack[-1].blocks.append(listing)
+        offset = line_end
+
+    if code is not None:
+        code[0].end = len(data)
+    return root
+
+
+def _list_info(item):
+    if item.group(1):
+        return "bullet"
+    return "ordered-bold" if item.group(3) else "ordered"
+
+
+def _cache_path(kind, digest):
+    return CACHE_DIR / kind / f"{digest}.json"
+
+
+def cache_get(kind, digest):
+    """Load a cached JSON record, or None if absent or unreadable."""
+    try:
+        return json.loads(_cache_path(kind, digest).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def cache_put(kind, digest, record):
+    """Persist a JSON record; the cache is best-effort, so write errors are ignored."""
+    path = _cache_path(kind, digest)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(record, separators=(",", ":")))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+_trees = {}  # digest -> Section, for this process
+
+
+def _tree_for_digest(digest, data=None):
+    """Tree from memory or the persisted cache; parse `data` on a miss (None if no data)."""
+    tree = _trees.get(digest)
+    if tree is not None:
+        return tree
+    record = cache_get("sections", digest)
+    if record and record.get("version") == SECTION_TREE_VERSION:
+        tree = Section.from_dict(record["tree"])
+    elif data is None:
+        return None
+    else:
+        tree = parse_section_tree(data)
+        cache_put("sections", digest, {"version": SECTION_TREE_VERSION, "tree": tree.to_dict()})
+    _trees[digest] = tree
+    return tree
+
+
+def section_tree(content):
+    """Section tree for Markdown text or bytes, via the content-hash cache."""
+    data = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+    return _tree_for_digest(hashlib.sha256(data).hexdigest(), data)
+
+
+def load_section_tree(filepath):
+    """Section tree for a Markdown file on disk.
+
+    An unchanged file (same size and mtime as when it was last hashed) is
+    resolved to its content hash without being read.
+    """
+    path = Path(filepath).resolve()
+    st = path.stat()
+    path_key = hashlib.sha256(str(path).encode("utf-8")).hexdigest()
+    seen = cache_get("paths", path_key)
+    if seen and seen["mtime_ns"] == st.st_mtime_ns and seen["size"] == st.st_size:
+        tree = _tree_for_digest(seen["digest"])
+        if tree is not None:
+            return tree
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    cache_put("paths", path_key, {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "digest": digest})
+    return _tree_for_digest(digest, data)
+
+
+# ============================================================
+# REFERENCE STUB SCANNER
+# ============================================================
+
+STUB_MIN_LINES = 30
+STUB_MARKER_RE = re.compile(rb"\b(?:TODO|STUB|placeholder|expand after)\b", re.IGNORECASE)
+
+
+@dataclass
+class StubScan:
+    """Result of scan_reference_stub(). `lines` is exact unless `lines_at_least` is set."""
+
+    is_stub: bool
+    lines: int
+    marker: str = ""
+    lines_at_least: bool = False
+
+
+def count_lines(buf, limit=None):
+    """Count lines the way str.splitlines() does for \\n-terminated text.
+
+    Stops early once `limit` lines have been seen.
+    """
+    size = len(buf)
+    lines = 0
+    pos = 0
+    while pos < size:
+        nl = buf.find(b"\n", pos)
+        lines += 1
+        if nl < 0 or (limit is not None and lines >= limit):
+            break
+        pos = nl + 1
+    return lines
+
+
+def scan_stub_buffer(buf, min_lines=STUB_MIN_LINES):
+    """Stub check over any bytes-like buffer (bytes, mmap, bundle entry)."""
+    lines = count_lines(buf, limit=min_lines)
+    if lines < min_lines:
+        return StubScan(is_stub=True, lines=lines)
+    marker = STUB_MARKER_RE.search(buf)
+    if marker:
+        # Only stubs are reported with a line count, so the full count is paid for rarely
+        return StubScan(is_stub=True, lines=count_lines(buf), marker=marker.group(0).decode("ascii"))
+    return StubScan(is_stub=False, lines=lines, lines_at_least=True)
+
+
+def scan_reference_stub(filepath, min_lines=STUB_MIN_LINES):
+    """Decide whether a reference file is a stub (< min_lines lines or has a stub marker).
+
+    Empty files are decided from st_size alone; everything else is scanned
+    through an mmap so no decoded copy of the file is ever materialized.
+    """
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return StubScan(is_stub=True, lines=0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return scan_stub_buffer(mm, min_lines)
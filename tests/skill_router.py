@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+"""Keyword router shared by the behavioral suite and the routing tools.
+
+Simulates Claude's skill routing by keyword/phrase matching against each
+skill's description: quoted trigger phrases, a penalty for words from the
+"Do NOT use for ..." clause, and topic overlap with the first sentence.
+
+Everything the scorer needs from a description is extracted once into a
+SkillProfile, so scoring many prompts (replays, batch evaluation) only pays
+for the prompt side.
+
+Modes (route_prompt(mode=...), or $SKILL_KIT_ROUTER; default "keyword"):
+  keyword  the scorer above
+  bm25     BM25 over each description (minus its exclusion clause) plus its
+           trigger phrases, so distinctive terms outweigh common ones. The
+           same exclusion penalty applies. Document frequencies and length
+           norms are precomputed once per catalog into flat arrays; a
+           prompt costs one walk over its terms' posting lists.
+  hierarchical, hierarchical-bm25
+           two stages. Stage one scores the lifecycle categories of
+           skill_categories (A-F) with BM25 over their members'
+           descriptions concatenated; stage two scores, with the keyword
+           or BM25 scorer, only the skills of the top STAGE_ONE_CATEGORIES
+           categories (plus skills outside A-F). When no category matches
+           or the top category leads the first dropped one by less than
+           STAGE_ONE_MARGIN, stage two scores every skill.
+
+Long prompts: prompts longer than PromptPolicy.max_chars (pasted stack
+traces, whole files) are not analyzed in full. window_prompt() makes one
+bounded pass over the prompt's lines: it keeps leading prose first,
+skipping fenced code and indented or traceback lines, until the head budget
+is full, then appends the prompt's tail. Work per prompt is bounded by
+scan_chars + head_chars + tail_chars, whatever the prompt length. Pass
+`policy=` to override the module default PROMPT_POLICY.
+
+Tracing: pass a list as `trace` to rank_profiles/route_prompt and it
+receives one compact tuple per scoring component and skill:
+
+  ("trigger", skill, matched_phrases, trigger_count, contribution)
+  ("exclusion", skill, overlapping_words, penalty)
+  ("topic", skill, overlapping_terms, contribution)
+  ("score", skill, raw, max_possible, normalized)
+  ("cutoff", skill, score)            # dropped at or below MIN_SCORE
+  ("window", "", prompt_chars, analyzed_chars)   # long prompt was windowed
+  ("stage1", "", ((category, score), ...), kept, fallback)   # hierarchical modes
+
+In bm25 mode the trigger and topic events are replaced by
+("bm25", skill, matched_terms, raw), and "score" reports raw against
+raw + BM25_SATURATION.
+
+The events come from the scorer itself (score_profile(trace=...)), so
+they always add up to the routed score. With trace=None (the default) the
+cost is a few `is not None` tests per skill, so tracing can stay in the
+hot path and be switched on per sampled request.
+
+Run: python3 tests/skill_router.py [--router MODE] "prompt to explain"
+"""
+
+import math
+import os
+import re
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+
+from routing_metrics import COUNT_BUCKETS, LATENCY_BUCKETS, REGISTRY
+from skill_categories import OTHER_CATEGORY, skill_category
+
+SCORER_VERSION = 1  # bump with any change to how prompts are scored; invalidates persisted scores
+TRIGGER_WEIGHT = 3.0
+TOPIC_WEIGHT = 2.0
+TOPIC_TERMS_CAP = 3  # topic overlap saturates at this many shared terms
+MIN_SCORE = 0.05  # skills at or below this score are not candidates
+AMBIGUITY_MARGIN = 0.15  # top two within this margin = no dominant skill
+
+ROUTER_MODES = ("keyword", "bm25", "hierarchical", "hierarchical-bm25")
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_SATURATION = 4.0  # normalized score = raw / (raw + this): 0.5 at a couple of distinctive hits
+BM25_EXCLUSION_PENALTY = 0.2  # per exclusion word, as in keyword mode (1.0 out of 5.0)
+BM25_STOPWORDS = frozenset(
+    "and are asks for from into not says the this that use user when with your".split()
+)
+STAGE_ONE_CATEGORIES = 2  # hierarchical modes fully score the skills of this many categories
+STAGE_ONE_MARGIN = 0.1  # top vs first dropped category closer than this: score every skill
+
+TRIGGER_PHRASE_RE = re.compile(r'"([^"]+)"')
+EXCLUSION_RE = re.compile(r"do not use for (.+?)(?:\.|$)")
+TERM_RE = re.compile(r"\b\w{4,}\b")
+BM25_TOKEN_RE = re.compile(r"\b\w{3,}\b")  # 3+ letters: keeps "mcp", "rag", "llm", "api"
+CODE_LINE_RE = re.compile(r'(?:    |\t)|\s*(?:at \S+[(:]|File "|Traceback \(most recent call last\))')
+FENCE_PREFIXES = ("```", "~~~")
+
+
+@dataclass(frozen=True)
+class PromptPolicy:
+    """How much of a long prompt the router reads."""
+
+    max_chars: int = 8192  # prompts up to this length are analyzed whole
+    head_chars: int = 6144  # budget for leading text (prose first)
+    tail_chars: int = 2048  # plus the prompt's last characters (the ask after a paste)
+    scan_chars: int = 262144  # never look further than this for prose
+    prose_first: bool = True  # skip fenced code, indented and traceback lines in the head
+
+
+PROMPT_POLICY = PromptPolicy()
+
+
+@dataclass(frozen=True)
+class SkillProfile:
+    """Routing features of one skill description."""
+
+    name: str
+    triggers: tuple  # quoted trigger phrases, lowercased, duplicates kept
+    exclusion_words: frozenset  # 4+ letter words of the "Do NOT use for" clause
+    key_terms: frozenset  # 4+ letter words of the first sentence
+
+
+@lru_cache(maxsize=4096)
+def build_profile(name, description):
+    """Extract a SkillProfile from a description (cached per description)."""
+    desc_lower = description.lower()
+    not_use_match = EXCLUSION_RE.search(desc_lower)
+    exclusion_words = frozenset(TERM_RE.findall(not_use_match.group(1))) if not_use_match else frozenset()
+    first_sentence = desc_lower.split(".")[0] if "." in desc_lower else desc_lower[:100]
+    return SkillProfile(
+        name=name,
+        triggers=tuple(TRIGGER_PHRASE_RE.findall(desc_lower)),
+        exclusion_words=exclusion_words,
+        key_terms=frozenset(TERM_RE.findall(first_sentence)),
+    )
+
+
+def build_profiles(skills):
+    """Profiles for a {name: {"description": ...}} skills dict, in dict order."""
+    return [build_profile(name, data["description"]) for name, data in skills.items()]
+
+
+def prompt_terms(prompt_lower):
+    return set(TERM_RE.findall(prompt_lower))
+
+
+def window_prompt(prompt, policy=None):
+    """Lowercased text the router analyzes: the whole prompt if short, else a bounded window."""
+    policy = PROMPT_POLICY if policy is None else policy
+    if len(prompt) <= policy.max_chars:
+        return prompt.lower()
+    head = _prose_head(prompt, policy) if policy.prose_first else prompt[:policy.head_chars]
+    tail = prompt[-policy.tail_chars:] if policy.tail_chars > 0 else ""
+    return f"{head}\n{tail}".lower()
+
+
+def _prose_head(prompt, policy):
+    """Up to head_chars of non-code lines from the first scan_chars of the prompt."""
+    end = min(len(prompt), policy.scan_chars)
+    pieces = []
+    size = 0
+    in_fence = False
+    pos = 0
+    while pos < end and size < policy.head_chars:
+        nl = prompt.find("\n", pos, end)
+        if nl == -1:
+            nl = end
+        line = prompt[pos:nl]
+        pos = nl + 1
+        if line.lstrip().startswith(FENCE_PREFIXES):
+            in_fence = not in_fence
+            continue
+        if in_fence or CODE_LINE_RE.match(line):
+            continue
+        pieces.append(line)
+        size += len(line) + 1
+    if not pieces:  # all code: fall back to the raw head
+        return prompt[:policy.head_chars]
+    return "\n".join(pieces)[:policy.head_chars]
+
+
+def score_profile(prompt_lower, terms, profile, trace=None):
+    """Score a lowercased prompt (and its 4+ letter terms) against a profile. 0.0-1.0.
+
+    With a `trace` list, each component appends its event as it is scored.
+    """
+    score = 0.0
+    max_possible = 0.0
+
+    # 1. Quoted trigger phrases from the description
+    if profile.triggers:
+        hits = [p for p in profile.triggers if p in prompt_lower]
+        contribution = TRIGGER_WEIGHT * (len(hits) / len(profile.triggers))
+        max_possible += TRIGGER_WEIGHT
+        score += contribution
+        if trace is not None:
+            trace.append(("trigger", profile.name, tuple(hits), len(profile.triggers), contribution))
+
+    # 2. "Do NOT use" exclusions — penalty if prompt matches exclusion
+    if profile.exclusion_words:
+        overlap = profile.exclusion_words & terms
+        if overlap:
+            score -= 1.0 * len(overlap)
+            if trace is not None:
+                trace.append(("exclusion", profile.name, tuple(sorted(overlap)), -1.0 * len(overlap)))
+
+    # 3. First sentence (what the skill does) for topic match
+    topic_overlap = profile.key_terms & terms
+    contribution = TOPIC_WEIGHT * min(len(topic_overlap) / TOPIC_TERMS_CAP, 1.0)
+    max_possible += TOPIC_WEIGHT
+    score += contribution
+    if trace is not None:
+        trace.append(("topic", profile.name, tuple(sorted(topic_overlap)), contribution))
+
+    # Normalize
+    normalized = max(0.0, min(1.0, score / max_possible))
+    if trace is not None:
+        trace.append(("score", profile.name, score, max_possible, normalized))
+    return normalized
+
+
+def format_trace(trace):
+    """Human-readable lines for trace events."""
+    lines = []
+    for event in trace:
+        kind, skill = event[0], event[1]
+        if kind == "trigger":
+            hits = ", ".join(f'"{p}"' for p in event[2]) or "none"
+            lines.append(f"  {skill}: triggers {len(event[2])}/{event[3]} ({hits}) -> +{event[4]:.2f}")
+        elif kind == "exclusion":
+            lines.append(f"  {skill}: exclusion words {', '.join(event[2])} -> {event[3]:.2f}")
+        elif kind == "bm25":
+            lines.append(f"  {skill}: bm25 terms {', '.join(event[2]) or 'none'} -> {event[3]:.2f}")
+        elif kind == "topic":
+            lines.append(f"  {skill}: topic terms {', '.join(event[2]) or 'none'} -> +{event[3]:.2f}")
+        elif kind == "score":
+            lines.append(f"  {skill}: {event[2]:.2f} / {event[3]:.2f} -> {event[4]:.2f}")
+        elif kind == "window":
+            lines.append(f"  long prompt: analyzed {event[3]} of {event[2]} chars")
+        elif kind == "cutoff":
+            lines.append(f"  {skill}: {event[2]:.2f} <= {MIN_SCORE} cutoff, not a candidate")
+        elif kind == "stage1":
+            ranked = ", ".join(f"{category} {score:.2f}" for category, score in event[2]) or "none"
+            kept = f"all skills (margin below {STAGE_ONE_MARGIN})" if event[4] else ", ".join(event[3])
+            lines.append(f"  stage one: categories {ranked} -> scoring {kept}")
+    return lines
+
+
+def score_prompt_against_skill(prompt: str, description: str, policy=None) -> float:
+    """
+    Score how well a prompt matches a skill description.
+    Simulates Claude's skill routing by keyword/phrase matching.
+    Long prompts are windowed like everywhere else (see window_prompt).
+    Returns 0.0-1.0 confidence score.
+    """
+    prompt_lower = window_prompt(prompt, policy)
+    return score_profile(prompt_lower, prompt_terms(prompt_lower), build_profile("", description))
+
+
+def rank_profiles(prompt, profiles, trace=None, policy=None):
+    """Sorted [(skill, score)] above MIN_SCORE for one prompt."""
+    prompt_lower = window_prompt(prompt, policy)
+    if trace is not None:
+        _trace_window(trace, prompt, prompt_lower)
+    return _rank_keyword(prompt_lower, prompt_terms(prompt_lower), profiles, trace)
+
+
+def _rank_keyword(prompt_lower, terms, profiles, trace=None):
+    """rank_profiles() for an already windowed prompt and its terms."""
+    if trace is not None:
+        return _rank_traced(prompt_lower, terms, profiles, trace)
+    scores = []
+    for profile in profiles:
+        s = score_profile(prompt_lower, terms, profile)
+        if s > MIN_SCORE:
+            scores.append((profile.name, s))
+    scores.sort(key=lambda x: -x[1])
+    return scores
+
+
+def _trace_window(trace, prompt, analyzed):
+    if len(analyzed) != len(prompt):
+        trace.append(("window", "", len(prompt), len(analyzed)))
+
+
+def _rank_traced(prompt_lower, terms, profiles, trace):
+    scores = []
+    for profile in profiles:
+        s = score_profile(prompt_lower, terms, profile, trace)
+        if s > MIN_SCORE:
+            scores.append((profile.name, s))
+        else:
+            trace.append(("cutoff", profile.name, s))
+    scores.sort(key=lambda x: -x[1])
+    return scores
+
+
+def bm25_tokens(text_lower):
+    return [t for t in BM25_TOKEN_RE.findall(text_lower) if t not in BM25_STOPWORDS]
+
+
+def bm25_document(description):
+    """Indexed tokens of a description: its text minus the exclusion clause, plus its triggers."""
+    desc_lower = description.lower()
+    not_use_match = EXCLUSION_RE.search(desc_lower)
+    body = desc_lower[:not_use_match.start()] if not_use_match else desc_lower
+    return bm25_tokens(body) + bm25_tokens(" ".join(TRIGGER_PHRASE_RE.findall(desc_lower)))
+
+
+@dataclass(frozen=True)
+class Bm25Index:
+    """BM25 statistics of one catalog in flat arrays.
+
+    Postings of term t are post_docs/post_weights[post_start[t]:post_start[t + 1]];
+    each weight is the term's full BM25 contribution to that document, so a
+    query only sums weights.
+    """
+
+    profiles: tuple  # SkillProfile per document, for names and exclusion words
+    vocab: dict  # term -> term id
+    idf: array  # 'd', per term id
+    doc_len: array  # 'I', tokens per document
+    post_start: array  # 'I', len(vocab) + 1 offsets
+    post_docs: array  # 'H', document ids
+    post_weights: array  # 'd'
+
+
+def build_bm25_index(skills):
+    """Index a {name: {"description": ...}} skills dict, in dict order."""
+    profiles = tuple(build_profiles(skills))
+    return _index_documents(profiles, [bm25_document(data["description"]) for data in skills.values()])
+
+
+def _index_documents(profiles, docs):
+    n = len(docs)
+    avg_len = sum(map(len, docs)) / n if n else 0.0
+    postings = {}  # term -> {doc id: tf}
+    for doc_id, tokens in enumerate(docs):
+        for token in tokens:
+            tf = postings.setdefault(token, {})
+            tf[doc_id] = tf.get(doc_id, 0) + 1
+
+    vocab = {}
+    idf = array("d")
+    post_start = array("I", [0])
+    post_docs = array("H")
+    post_weights = array("d")
+    for term in sorted(postings):
+        tfs = postings[term]
+        term_idf = math.log((n - len(tfs) + 0.5) / (len(tfs) + 0.5) + 1.0)
+        vocab[term] = len(idf)
+        idf.append(term_idf)
+        for doc_id, tf in sorted(tfs.items()):
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * len(docs[doc_id]) / avg_len)
+            post_docs.append(doc_id)
+            post_weights.append(term_idf * tf * (BM25_K1 + 1.0) / (tf + norm))
+        post_start.append(len(post_docs))
+    return Bm25Index(profiles, vocab, idf, array("I", map(len, docs)), post_start, post_docs, post_weights)
+
+
+_bm25_indexes = {}  # ((name, description), ...) -> Bm25Index, for this process
+
+
+def bm25_index(skills):
+    """Cached Bm25Index for a skills dict; rebuilt when any description changes."""
+    key = tuple((name, data["description"]) for name, data in skills.items())
+    index = _bm25_indexes.get(key)
+    if index is None:
+        index = _bm25_indexes[key] = build_bm25_index(skills)
+    return index
+
+
+def rank_bm25(prompt, index, trace=None, policy=None, doc_ids=None):
+    """Sorted [(skill, score)] above MIN_SCORE for one prompt, BM25 mode.
+
+    With `doc_ids`, only those documents are scored (hierarchical stage two).
+    """
+    prompt_lower = window_prompt(prompt, policy)
+    if trace is not None:
+        _trace_window(trace, prompt, prompt_lower)
+    query, terms = bm25_query(prompt_lower)
+    return _rank_bm25(query, terms, index, trace, doc_ids)
+
+
+def bm25_query(prompt_lower):
+    """(BM25 query terms, 4+ letter terms) of a windowed prompt, in one tokenizing pass.
+
+    The 4+ letter terms are a subset of the 3+ letter tokens and equal
+    prompt_terms(), so they serve exclusion checks and keyword scoring alike.
+    """
+    tokens = BM25_TOKEN_RE.findall(prompt_lower)
+    return {t for t in tokens if t not in BM25_STOPWORDS}, {t for t in tokens if len(t) >= 4}
+
+
+def _rank_bm25(query, terms, index, trace=None, doc_ids=None):
+    """rank_bm25() for an already tokenized prompt."""
+    raw = [0.0] * len(index.profiles)
+    matched = {} if trace is not None else None
+    for term in query:
+        term_id = index.vocab.get(term)
+        if term_id is None:
+            continue
+        for k in range(index.post_start[term_id], index.post_start[term_id + 1]):
+            doc_id = index.post_docs[k]
+            raw[doc_id] += index.post_weights[k]
+            if matched is not None:
+                matched.setdefault(doc_id, []).append(term)
+
+    scores = []
+    for doc_id in range(len(raw)) if doc_ids is None else doc_ids:
+        profile = index.profiles[doc_id]
+        s = raw[doc_id] / (raw[doc_id] + BM25_SATURATION)
+        overlap = profile.exclusion_words & terms if profile.exclusion_words else ()
+        if overlap:
+            s -= BM25_EXCLUSION_PENALTY * len(overlap)
+        s = max(0.0, min(1.0, s))
+        if trace is not None:
+            trace.append(("bm25", profile.name, tuple(sorted(matched.get(doc_id, ()))), raw[doc_id]))
+            if overlap:
+                trace.append(("exclusion", profile.name, tuple(sorted(overlap)), -BM25_EXCLUSION_PENALTY * len(overlap)))
+            trace.append(("score", profile.name, raw[doc_id], raw[doc_id] + BM25_SATURATION, s))
+        if s > MIN_SCORE:
+            scores.append((profile.name, s))
+        elif trace is not None:
+            trace.append(("cutoff", profile.name, s))
+    scores.sort(key=lambda x: -x[1])
+    return scores
+
+
+@dataclass(frozen=True)
+class CategoryIndex:
+    """Stage one of the hierarchical modes: one BM25 document per category."""
+
+    index: Bm25Index  # documents are categories: members' BM25 documents concatenated
+    members: dict  # category -> skill positions in the skills dict
+    always: tuple  # positions of skills no category fits, always scored
+
+
+def build_category_index(skills):
+    """Place every skill in a category, then index the categories.
+
+    A skill's category is its frontmatter `category`, else its README
+    code (skill_categories), else the category its own description ranks
+    first against, if that one leads the runner-up by STAGE_ONE_MARGIN.
+    Skills that fit none are scored on every route.
+    """
+    members = {}
+    docs = {}
+    unplaced = []
+    for position, (name, data) in enumerate(skills.items()):
+        doc = bm25_document(data["description"])
+        category = skill_category(name, data.get("category"))
+        if category == OTHER_CATEGORY:
+            unplaced.append((position, doc))
+            continue
+        members.setdefault(category, []).append(position)
+        docs.setdefault(category, []).extend(doc)
+    index = _category_documents(docs)
+
+    always = []
+    placed = 0
+    for position, doc in unplaced:
+        ranked = _rank_bm25(set(doc), frozenset(), index)
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        if ranked and ranked[0][1] - runner_up >= STAGE_ONE_MARGIN:
+            members[ranked[0][0]].append(position)
+            docs[ranked[0][0]].extend(doc)
+            placed += 1
+        else:
+            always.append(position)
+    if placed:
+        index = _category_documents(docs)
+    return CategoryIndex(
+        index,
+        {category: tuple(sorted(positions)) for category, positions in members.items()},
+        tuple(always),
+    )
+
+
+def _category_documents(docs):
+    profiles = tuple(SkillProfile(category, (), frozenset(), frozenset()) for category in docs)
+    return _index_documents(profiles, list(docs.values()))
+
+
+_category_indexes = {}  # ((name, description, category), ...) -> CategoryIndex, for this process
+
+
+def category_index(skills):
+    """Cached CategoryIndex for a skills dict; rebuilt when any description or category changes."""
+    key = tuple((name, data["description"], data.get("category")) for name, data in skills.items())
+    index = _category_indexes.get(key)
+    if index is None:
+        index = _category_indexes[key] = build_category_index(skills)
+    return index
+
+
+def stage_one(query, categories, trace=None):
+    """Sorted skill positions to score for a prompt's BM25 query terms, or None to score every skill."""
+    ranked = _rank_bm25(query, frozenset(), categories.index)
+    kept = ranked[:STAGE_ONE_CATEGORIES]
+    fallback = not ranked or (
+        len(ranked) > STAGE_ONE_CATEGORIES and kept[0][1] - ranked[STAGE_ONE_CATEGORIES][1] < STAGE_ONE_MARGIN
+    )
+    if trace is not None:
+        trace.append(("stage1", "", tuple(ranked), tuple(category for category, _ in kept), fallback))
+    if fallback:
+        STAGE_ONE_FALLBACKS.inc()
+        return None
+    return sorted(categories.always + sum((categories.members[category] for category, _ in kept), ()))
+
+
+def make_staged_ranker(skills, mode=None, policy=None):
+    """prompt -> ([(skill, score)], skills scored) for a hierarchical mode.
+
+    The prompt is windowed and tokenized once; both stages score those terms.
+    """
+    categories = category_index(skills)
+    bm25 = router_mode(mode) == "hierarchical-bm25"
+    index = bm25_index(skills) if bm25 else None
+    profiles = None if bm25 else build_profiles(skills)
+
+    def rank(prompt, trace=None):
+        prompt_lower = window_prompt(prompt, policy)
+        if trace is not None:
+            _trace_window(trace, prompt, prompt_lower)
+        query, terms = bm25_query(prompt_lower)
+        positions = stage_one(query, categories, trace)
+        if bm25:
+            routing = _rank_bm25(query, terms, index, trace, positions)
+            return routing, len(skills) if positions is None else len(positions)
+        subset = profiles if positions is None else [profiles[p] for p in positions]
+        return _rank_keyword(prompt_lower, terms, subset, trace), len(subset)
+    return rank
+
+
+def clear_caches():
+    """Drop every cached profile and index, e.g. to measure cold routing."""
+    build_profile.cache_clear()
+    _bm25_indexes.clear()
+    _category_indexes.clear()
+
+
+def router_mode(mode=None):
+    """The routing mode to use: `mode`, else $SKILL_KIT_ROUTER, else "keyword"."""
+    mode = mode or os.environ.get("SKILL_KIT_ROUTER") or "keyword"
+    if mode not in ROUTER_MODES:
+        raise ValueError(f"unknown router mode {mode!r} (expected one of: {', '.join(ROUTER_MODES)})")
+    return mode
+
+
+def split_router_arg(args):
+    """(mode or None, other args) from a tool's argv; takes `--router MODE` or `--router=MODE` anywhere."""
+    mode, rest = None, []
+    args = iter(args)
+    for arg in args:
+        if arg == "--router":
+            mode = next(args, "")
+        elif arg.startswith("--router="):
+            mode = arg.split("=", 1)[1]
+        else:
+            rest.append(arg)
+    if mode is None:
+        return None, rest
+    if not mode:
+        raise ValueError(f"--router needs a mode (expected one of: {', '.join(ROUTER_MODES)})")
+    return router_mode(mode), rest
+
+
+def make_ranker(skills, mode=None, policy=None):
+    """prompt -> [(skill, score)] for a fixed skills dict, with profiles/index built once."""
+    mode = router_mode(mode)
+    if mode.startswith("hierarchical"):
+        staged = make_staged_ranker(skills, mode, policy)
+        return lambda prompt, trace=None: staged(prompt, trace)[0]
+    if mode == "bm25":
+        index = bm25_index(skills)
+        return lambda prompt, trace=None: rank_bm25(prompt, index, trace, policy)
+    profiles = build_profiles(skills)
+    return lambda prompt, trace=None: rank_profiles(prompt, profiles, trace, policy)
+
+
+ROUTES = REGISTRY.counter("skill_router_routes_total", "Prompts routed by route_prompt")
+ROUTE_SECONDS = REGISTRY.histogram("skill_router_route_seconds", "route_prompt latency", LATENCY_BUCKETS)
+SKILLS_SCORED = REGISTRY.counter("skill_router_skills_scored_total", "Skill profiles scored")
+SKILLS_PRUNED = REGISTRY.counter("skill_router_skills_pruned_total", f"Scored skills at or below {MIN_SCORE}")
+CANDIDATES = REGISTRY.histogram("skill_router_candidates", f"Skills above {MIN_SCORE} per prompt", COUNT_BUCKETS)
+STAGE_ONE_FALLBACKS = REGISTRY.counter(
+    "skill_router_stage_one_fallbacks_total", "Hierarchical prompts scored against every skill"
+)
+
+
+def _profile_cache_hit_ratio():
+    info = build_profile.cache_info()
+    lookups = info.hits + info.misses
+    return info.hits / lookups if lookups else 0.0
+
+
+REGISTRY.gauge("skill_router_profile_cache_hit_ratio", "build_profile cache hits / lookups", _profile_cache_hit_ratio)
+
+
+def route_prompt(prompt: str, skills: dict, trace=None, mode=None, policy=None) -> list:
+    """Route a prompt to skills, return sorted list of (skill, score)."""
+    started = time.perf_counter()
+    mode = router_mode(mode)
+    scored = len(skills)
+    if mode.startswith("hierarchical"):
+        routing, scored = make_staged_ranker(skills, mode, policy)(prompt, trace)
+    elif mode == "bm25":
+        routing = rank_bm25(prompt, bm25_index(skills), trace, policy)
+    else:
+        routing = rank_profiles(prompt, build_profiles(skills), trace, policy)
+    ROUTE_SECONDS.observe(time.perf_counter() - started)
+    ROUTES.inc()
+    SKILLS_SCORED.inc(scored)
+    SKILLS_PRUNED.inc(scored - len(routing))
+    CANDIDATES.observe(len(routing))
+    return routing
+
+
+def is_ambiguous(routing):
+    """True when no single skill dominates: top two within AMBIGUITY_MARGIN."""
+    return len(routing) >= 2 and routing[0][1] - routing[1][1] < AMBIGUITY_MARGIN
+
+
+if __name__ == "__main__":
+    from test_skills_behavioral import load_all_skills
+
+    mode, args = split_router_arg(sys.argv[1:])
+    if not args:
+        print(__doc__.split("Run:")[1].rstrip())
+        sys.exit(2)
+    prompt = " ".join(args)
+    trace = []
+    routing = route_prompt(prompt, load_all_skills(), trace, mode)
+    print("=" * 60)
+    print(f"  ROUTING TRACE: \"{prompt[:48]}\"")
+    print("=" * 60)
+    print("\n".join(format_trace(trace)))
+    print("-" * 60)
+    for name, score in routing[:3]:
+        print(f"  {name}: {score:.2f}")
+    if is_ambiguous(routing):
+        print(f"  (ambiguous: top two within {AMBIGUITY_MARGIN})")
+    print("=" * 60)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Where skills are read from: a skills directory or a packed bundle.
+
+Validators, the router and the analysis tools read skill files through a
+source object instead of touching paths directly, so the same checks run
+against `.claude/skills/` or a single `.skillpack` file (see
+skill_bundle.py). Paths inside a source are POSIX-style and relative to the
+skills root, e.g. "building-rag-pipeline/references/chunking.md".
+
+Set SKILL_KIT_SOURCE to a directory or bundle to validate something other
+than this repo's `.claude/skills/`.
+"""
+
+import os
+from pathlib import Path
+
+from skill_docs import load_section_tree, scan_reference_stub, scan_stub_buffer, section_tree
+
+SKILLS_DIR = Path(__file__).parent.parent / ".claude" / "skills"
+BUNDLE_SUFFIX = ".skillpack"
+
+
+class DirectorySource:
+    """Skills laid out on disk as {skill}/SKILL.md and {skill}/references/*.md."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.label = str(self.root)
+
+    def skill_names(self):
+        """Skill directory names (any non-hidden directory), sorted."""
+        if not self.root.is_dir():
+            return []
+        return sorted(d.name for d in self.root.iterdir() if d.is_dir() and not d.name.startswith("."))
+
+    def list_files(self, reldir, suffix=".md"):
+        """Sorted file names directly inside `reldir` ending with `suffix`."""
+        directory = self.root / reldir
+        if not directory.is_dir():
+            return []
+        return sorted(p.name for p in directory.iterdir() if p.name.endswith(suffix) and p.is_file())
+
+    def exists(self, relpath):
+        return (self.root / relpath).exists()
+
+    def is_dir(self, relpath):
+        return (self.root / relpath).is_dir()
+
+    def read_bytes(self, relpath):
+        return (self.root / relpath).read_bytes()
+
+    def read_text(self, relpath):
+        return (self.root / relpath).read_text()
+
+    def size(self, relpath):
+        return (self.root / relpath).stat().st_size
+
+    def fingerprint(self, relpath):
+        """Identity of a file's current version, for caches: (mtime_ns, size)."""
+        st = (self.root / relpath).stat()
+        return st.st_mtime_ns, st.st_size
+
+    def cache_id(self, relpath):
+        return str((self.root / relpath).resolve())
+
+    def local_path(self, relpath):
+        """Real filesystem path, or None for sources without one."""
+        return self.root / relpath
+
+    def close(self):
+        """Nothing to release; sources share this interface with SkillBundle."""
+
+
+def open_skill_source(location):
+    """Open a skills directory or a bundle file as a source."""
+    path = Path(location)
+    if path.is_file():
+        from skill_bundle import SkillBundle
+
+        return SkillBundle(path)
+    return DirectorySource(path)
+
+
+def as_skill_source(location_or_source):
+    """Pass sources through; open paths."""
+    if isinstance(location_or_source, (str, os.PathLike)):
+        return open_skill_source(location_or_source)
+    return location_or_source
+
+
+def default_skill_source():
+    """$SKILL_KIT_SOURCE if set, otherwise this repo's .claude/skills/."""
+    return open_skill_source(os.environ.get("SKILL_KIT_SOURCE") or SKILLS_DIR)
+
+
+def reference_dirs(source, skill):
+    """Existing reference directories of a skill: 'references', then legacy 'reference'."""
+    return [name for name in ("references", "reference") if source.is_dir(f"{skill}/{name}")]
+
+
+def source_section_tree(source, relpath):
+    """Section tree of a file in any source (stat-cached for directories)."""
+    local = source.local_path(relpath)
+    if local is not None:
+        return load_section_tree(local)
+    return section_tree(source.read_bytes(relpath))
+
+
+def source_stub_scan(source, relpath):
+    """Reference stub scan of a file in any source (mmap for directories)."""
+    local = source.local_path(relpath)
+    if local is not None:
+        return scan_reference_stub(local)
+    return scan_stub_buffer(source.read_bytes(relpath))
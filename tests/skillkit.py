@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Single entry point for the validation suites and tools (pre-commit, CI).
+
+Only the modules of the requested command are imported, so running the
+structural suite from a hook never loads the case shards or the behavioral
+suite. It does import skill_router (routing_manifest shares its
+description patterns) but builds no profiles or indexes. With --timing,
+import and run times go to stderr.
+
+Run:
+  python3 tests/skillkit.py [--timing] COMMAND [ARGS ...]
+
+Commands:
+  structural   test_skills.py              behavioral   test_skills_behavioral.py
+  all          both suites                 tokens       token_costs.py
+  load         load_simulator.py           refs         reference_graph.py
+  catalog      skill_catalog.py            manifest     routing_manifest.py
+  replay       replay_prompts.py           matrix       score_matrix.py
+  explain      skill_router.py             metrics      routing_metrics.py
+  bundle       skill_bundle.py             compare      compare_routers.py
+  prefetch     prefetch.py                 sweep        router_sweep.py
+"""
+
+import importlib
+import runpy
+import sys
+import time
+
+SUITES = {
+    "structural": "test_skills",
+    "behavioral": "test_skills_behavioral",
+}
+TOOLS = {
+    "tokens": "token_costs",
+    "load": "load_simulator",
+    "refs": "reference_graph",
+    "catalog": "skill_catalog",
+    "manifest": "routing_manifest",
+    "replay": "replay_prompts",
+    "matrix": "score_matrix",
+    "explain": "skill_router",
+    "metrics": "routing_metrics",
+    "bundle": "skill_bundle",
+    "compare": "compare_routers",
+    "prefetch": "prefetch",
+    "sweep": "router_sweep",
+}
+
+
+def run_suite(module_name, argv, timing=False):
+    """Import a suite and run its main(); returns the exit code."""
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    imported = time.perf_counter()
+    code = module.main(argv)
+    if timing:
+        print(
+            f"[skillkit] {module_name}: import {(imported - started) * 1000:.0f} ms, "
+            f"run {(time.perf_counter() - imported) * 1000:.0f} ms",
+            file=sys.stderr,
+        )
+    return code
+
+
+def run_tool(module_name, argv, timing=False):
+    """Run a tool's __main__ block with `argv`; returns the exit code."""
+    started = time.perf_counter()
+    sys.argv = [f"{module_name}.py"] + argv
+    try:
+        runpy.run_module(module_name, run_name="__main__", alter_sys=True)
+        code = 0
+    except SystemExit as exc:
+        code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+    if timing:
+        print(f"[skillkit] {module_name}: {(time.perf_counter() - started) * 1000:.0f} ms", file=sys.stderr)
+    return code
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    timing = "--timing" in argv
+    argv = [a for a in argv if a != "--timing"]
+    if not argv or argv[0] not in {*SUITES, *TOOLS, "all"}:
+        print(__doc__.split("Run:")[1].rstrip())
+        return 2
+    command, args = argv[0], argv[1:]
+    if command == "all":
+        return max([run_suite(module_name, [], timing) for module_name in SUITES.values()])
+    if command in SUITES:
+        return run_suite(SUITES[command], args, timing)
+    return run_tool(TOOLS[command], args, timing)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
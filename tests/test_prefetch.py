@@ -0,0 +1,159 @@
+"""FileCache and Prefetcher: LRU order, byte budget, hit accounting and background warming."""
+
+import threading
+
+import pytest
+
+from prefetch import FileCache, Prefetcher
+from skill_catalog import load_catalog
+from skill_categories import SKILLS_BY_CODE
+from skill_source import DirectorySource
+
+
+class CountingSource(DirectorySource):
+    """A directory source that counts reads per file."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.reads = {}
+        self._lock = threading.Lock()
+
+    def read_bytes(self, relpath):
+        with self._lock:
+            self.reads[relpath] = self.reads.get(relpath, 0) + 1
+        return super().read_bytes(relpath)
+
+
+@pytest.fixture
+def files(tmp_path):
+    for name, size in (("a", 4), ("b", 4), ("c", 4), ("big", 64)):
+        (tmp_path / name).write_bytes(b"x" * size)
+    return CountingSource(tmp_path)
+
+
+def test_lru_eviction(files):
+    cache = FileCache({"r": files}, budget=10)
+    cache.read(("r", "a"))
+    cache.read(("r", "b"))
+    cache.read(("r", "a"))  # b is now least recently used
+    cache.read(("r", "c"))
+    assert ("r", "a") in cache and ("r", "c") in cache
+    assert ("r", "b") not in cache
+    assert cache.stats.evictions == 1
+
+
+def test_byte_budget(files):
+    cache = FileCache({"r": files}, budget=10)
+    for name in ("a", "b", "c", "big", "a", "big"):
+        cache.read(("r", name))
+        assert cache.size <= cache.budget
+    cache.warm(("r", "big"))
+    assert ("r", "big") not in cache
+    assert files.reads["big"] == 2  # too large to cache, so every read goes to the source
+
+
+def test_hit_accounting(files):
+    cache = FileCache({"r": files}, budget=100)
+    cache.warm(("r", "a"))
+    cache.warm(("r", "a"))  # already cached: no second source read
+    cache.read(("r", "a"))
+    cache.read(("r", "a"))
+    cache.read(("r", "b"))
+    cache.warm(("r", "b"))  # cached by the demand read: not counted as prefetched
+    stats = cache.stats
+    assert (stats.reads, stats.hits, stats.cold_reads) == (3, 2, 1)
+    assert (stats.prefetched, stats.prefetch_hits) == (1, 1)
+    assert files.reads == {"a": 1, "b": 1}
+
+
+def test_unused_prefetch(files):
+    cache = FileCache({"r": files}, budget=8)
+    cache.warm(("r", "a"))
+    cache.read(("r", "b"))
+    cache.read(("r", "c"))  # evicts a before anything read it
+    assert cache.stats.prefetch_unused == 1
+    assert cache.stats.prefetch_hits == 0
+
+
+def test_concurrent_reads_and_warms(files):
+    cache = FileCache({"r": files}, budget=100)
+    keys = [("r", name) for name in ("a", "b", "c")]
+    barrier = threading.Barrier(8)
+
+    def worker(i):
+        barrier.wait()
+        for _ in range(50):
+            for key in keys:
+                (cache.warm if i % 2 else cache.read)(key)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats
+    assert files.reads == {"a": 1, "b": 1, "c": 1}
+    assert stats.reads == 4 * 50 * len(keys)
+    assert stats.cold_reads + stats.prefetched == len(keys)
+    assert stats.prefetch_hits == stats.prefetched
+
+
+class GatedSource(DirectorySource):
+    """A directory source whose reads of one file block until released."""
+
+    def __init__(self, root, gated):
+        super().__init__(root)
+        self.gated = gated
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def read_bytes(self, relpath):
+        if relpath == self.gated:
+            self.entered.set()
+            self.release.wait(timeout=5)
+        return super().read_bytes(relpath)
+
+
+def test_reads_never_wait_on_a_slow_warm(files):
+    source = GatedSource(files.root, "b")
+    cache = FileCache({"r": source}, budget=100)
+    cache.read(("r", "a"))
+    warming = threading.Thread(target=cache.warm, args=(("r", "b"),))
+    warming.start()
+    assert source.entered.wait(timeout=5)
+    assert cache.read(("r", "a")) == b"xxxx"  # cached
+    assert cache.read(("r", "c")) == b"xxxx"  # cold, from the source
+    assert ("r", "b") not in cache  # the warm is still in flight
+    source.release.set()
+    warming.join()
+    assert cache.read(("r", "b")) == b"xxxx"
+    assert (cache.stats.cold_reads, cache.stats.prefetch_hits) == (2, 1)
+
+
+def write_skill(root, skill, references):
+    mentions = "\n".join(f"- Read `references/{name}` for details." for name in references)
+    (root / skill / "references").mkdir(parents=True)
+    (root / skill / "SKILL.md").write_text(
+        f"---\nname: {skill}\ndescription: Test skill {skill}.\n---\n\n# {skill}\n\n{mentions}\n"
+    )
+    for name in references:
+        (root / skill / "references" / name).write_text(f"# {name}\n")
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_prefetcher_warms_next_skill(tmp_path, background):
+    first, second = SKILLS_BY_CODE["A1"], SKILLS_BY_CODE["A2"]  # consecutive in the greenfield chain
+    write_skill(tmp_path / "project", first, ["one.md"])
+    write_skill(tmp_path / "personal", second, ["two.md", "three.md"])
+    with load_catalog([("project", tmp_path / "project"), ("personal", tmp_path / "personal")]) as catalog:
+        prefetcher = Prefetcher(catalog, catalog.routing_skills(), background=background)
+        prefetcher.activate(first)
+        prefetcher.close()  # waits for the background warm
+        cache = prefetcher.cache
+        assert ("personal", f"{second}/SKILL.md") in cache
+        assert ("personal", f"{second}/references/two.md") in cache
+        before = cache.stats.cold_reads
+        for key in [prefetcher.skill_file(second)] + prefetcher.reference_files(second):
+            cache.read(key)
+    assert cache.stats.cold_reads == before
+    assert cache.stats.prefetch_hits == 3
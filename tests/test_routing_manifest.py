@@ -0,0 +1,27 @@
+"""The routing manifest: what its hashes cover and what routers rebuild from it."""
+
+from routing_manifest import build_manifest, manifest_profiles
+from skill_router import build_profile
+from skill_source import DirectorySource
+
+
+def test_profiles_match_skill_files(routing_skills):
+    for profile in manifest_profiles(build_manifest()):
+        assert profile == build_profile(profile.name, routing_skills[profile.name]["description"])
+
+
+def test_hash_covers_routing_fields_only(tmp_path):
+    skill_md = tmp_path / "gathering-data" / "SKILL.md"
+    skill_md.parent.mkdir()
+    frontmatter = "---\nname: gathering-data\ndescription: {}\n---\n"
+    description = 'Gathers data. Use when user says "collect data". Do NOT use for reports.'
+    skill_md.write_text(frontmatter.format(description) + "\n# Gathering data\n")
+    before = build_manifest(DirectorySource(tmp_path))
+
+    skill_md.write_text(skill_md.read_text() + "\nMore instructions.\n")
+    assert build_manifest(DirectorySource(tmp_path))["hash"] == before["hash"]
+
+    skill_md.write_text(frontmatter.format(description.replace("reports", "dashboards")))
+    after = build_manifest(DirectorySource(tmp_path))
+    assert after["hash"] != before["hash"]
+    assert after["skills"][0]["exclusions"] == ["dashboards"]
@@ -0,0 +1,84 @@
+"""Every check of test_skills.py and test_skills_behavioral.py as pytest items.
+
+Per-skill checks are parametrized by skill (or case shard), so
+`pytest tests -k building-rag` runs one skill's checks and
+`pytest tests -n auto` spreads them over pytest-xdist workers, each loading
+the catalog once. Outcomes come from pytest_skillkit.check_records().
+"""
+
+import pytest
+
+import test_skills as structural
+import test_skills_behavioral as behavioral
+from case_shards import load_shard, shard_names
+from pytest_skillkit import check_records
+from token_costs import skill_token_report
+
+SKILL_NAMES = sorted(set(structural.EXPECTED_SKILLS) | set(structural.SKILLS.skill_names()))
+
+STRUCTURAL_SKILL_CHECKS = {
+    "present": structural.test_all_skills_present,
+    "frontmatter": structural.test_yaml_frontmatter,
+    "workflow": structural.test_workflow_structure,
+    "references": structural.test_reference_files_exist,
+    "reference-dir": structural.test_directory_naming_consistency,
+    "stubs": structural.test_reference_stubs,
+    "exclusions": structural.test_exclusions_present,
+    "artifacts": structural.test_artifact_paths,
+    "tokens": structural.test_token_budgets,
+}
+STRUCTURAL_CATALOG_CHECKS = {
+    "unexpected-skills": structural.test_no_unexpected_skills,
+    "trigger-overlaps": structural.test_trigger_overlaps,
+    "catalog-completeness": structural.test_catalog_completeness,
+    "metadata-total": lambda: structural.report_metadata_total(skill_token_report(structural.SKILLS)),
+    "dead-references": structural.test_dead_references,
+    "duplicate-references": structural.test_duplicate_references,
+}
+BEHAVIORAL_SKILL_CHECKS = {
+    "description": behavioral.test_description_quality,
+    "completeness": behavioral.test_workflow_completeness,
+}
+
+
+@pytest.mark.parametrize("skill", SKILL_NAMES)
+@pytest.mark.parametrize("check", STRUCTURAL_SKILL_CHECKS)
+def test_structural(check, skill):
+    with structural.collect_reports() as records:
+        STRUCTURAL_SKILL_CHECKS[check]({skill})
+    check_records(records)
+
+
+@pytest.mark.parametrize("check", STRUCTURAL_CATALOG_CHECKS)
+def test_structural_catalog(check):
+    with structural.collect_reports() as records:
+        STRUCTURAL_CATALOG_CHECKS[check]()
+    check_records(records)
+
+
+def test_catalog_roots(skill_catalog):
+    with structural.collect_reports() as records:
+        structural.test_catalog_roots(skill_catalog)
+    check_records(records)
+
+
+@pytest.mark.parametrize("shard", shard_names())
+@pytest.mark.parametrize("suite", behavioral.SHARD_RUNNERS)
+def test_behavioral_shard(suite, shard, routing_skills):
+    check_records(behavioral.SHARD_RUNNERS[suite](shard, load_shard(shard), routing_skills))
+
+
+@pytest.mark.parametrize("skill", SKILL_NAMES)
+@pytest.mark.parametrize("check", BEHAVIORAL_SKILL_CHECKS)
+def test_behavioral(check, skill, routing_skills):
+    with behavioral.collect_reports() as records:
+        BEHAVIORAL_SKILL_CHECKS[check]({skill}, routing_skills)
+    check_records(records)
+
+
+def test_check_records_outcomes():
+    check_records([("info", "  --- looked, nothing to report ---")])  # examined and clean: passes
+    with pytest.raises(pytest.skip.Exception):
+        check_records([])  # never examined: out of scope
+    with pytest.raises(pytest.fail.Exception):
+        check_records([("info", "header"), ("fail", "broken")])
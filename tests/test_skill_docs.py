@@ -0,0 +1,26 @@
+"""Section-tree structure checks against the patterns the original Test 4 accepted."""
+
+import pytest
+
+from skill_docs import section_tree
+
+
+@pytest.mark.parametrize("body", [
+    "1. Gather\n2. **Pick**\n",  # bold on a later item of the run
+    "- intro\n1. **Gather**\n",  # ordered bold items continuing a bullet run
+    "###1. Gather\n",  # step heading without a space
+    "### Step 2: Pick\n",
+    "## Build Workflow\n",
+    "1. **Gather**\n",
+])
+def test_numbered_workflow(body):
+    assert section_tree(f"# Skill\n\n{body}").has_numbered_workflow()
+
+
+@pytest.mark.parametrize("body", [
+    "1. Gather\n2. Pick\n",
+    "- **Gather**\n- **Pick**\n",
+    "#1 is not a heading\n",
+])
+def test_no_numbered_workflow(body):
+    assert not section_tree(f"# Skill\n\n{body}").has_numbered_workflow()
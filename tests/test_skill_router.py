@@ -0,0 +1,41 @@
+"""Hierarchical routing: how skills outside the README catalog get a category."""
+
+from skill_categories import OTHER_CATEGORY, skill_category
+from skill_router import build_category_index
+
+
+def with_skill(skills, name, description, category=None):
+    extended = dict(skills)
+    extended[name] = {"description": description, "category": category, "full_content": ""}
+    return extended, list(extended).index(name)
+
+
+def members_of(categories, position):
+    return [category for category, positions in categories.members.items() if position in positions]
+
+
+def test_declared_category():
+    assert skill_category("gathering-data", "Deploy & Observe") == "D"
+    assert skill_category("gathering-data", "b") == "B"
+    assert skill_category("gathering-data", "misc") == OTHER_CATEGORY
+    assert skill_category("building-mcp-server", "D") == "D"  # frontmatter wins over the README
+
+
+def test_frontmatter_category_is_used(routing_skills):
+    skills, position = with_skill(routing_skills, "gathering-data", "Gathers data.", category="Build")
+    categories = build_category_index(skills)
+    assert members_of(categories, position) == ["B"]
+    assert position not in categories.always
+
+
+def test_nearest_category_by_description(routing_skills):
+    description = routing_skills["building-mcp-server"]["description"]
+    skills, position = with_skill(routing_skills, "serving-mcp-tools", description)
+    assert members_of(build_category_index(skills), position) == ["B"]
+
+
+def test_unrelated_skill_is_always_scored(routing_skills):
+    skills, position = with_skill(routing_skills, "brewing-coffee", "Brews espresso with crema.")
+    categories = build_category_index(skills)
+    assert members_of(categories, position) == []
+    assert position in categories.always
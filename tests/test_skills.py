@@ -2,13 +2,22 @@
 """Structural validation tests for the Agent Skill Kit."""
 
 import os
-import re
-import yaml
 import sys
 from pathlib import Path
 from collections import defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+
+from skill_catalog import TRIGGER_PHRASE_RE, load_catalog, parse_frontmatter
+from skill_docs import scan_skill_doc
+from skill_source import default_skill_source, reference_dirs, source_section_tree, source_stub_scan
+from reference_graph import build_reference_graph, extract_reference_mentions, find_duplicates
+from routing_manifest import MANIFEST_NAME, build_manifest, catalog_skill_names, manifest_drift, read_manifest
+from token_costs import METADATA_TOTAL_BUDGET, budget_status, skill_token_report
 
 SKILLS_DIR = Path(__file__).parent.parent / ".claude" / "skills"
+# Directory or .skillpack bundle under test ($SKILL_KIT_SOURCE, default SKILLS_DIR)
+SKILLS = default_skill_source()
 
 # Expected 18 skills from blueprint
 EXPECTED_SKILLS = [
@@ -37,9 +46,13 @@ FAIL = "\033[91mFAIL\033[0m"
 WARN = "\033[93mWARN\033[0m"
 
 results = {"pass": 0, "fail": 0, "warn": 0}
+_collected = None  # list receiving report() records inside collect_reports()
 
 
 def report(status, msg):
+    if _collected is not None:
+        _collected.append((status, msg))
+        return
     if status == "pass":
         print(f"  {PASS}  {msg}")
         results["pass"] += 1
@@ -51,51 +64,35 @@ def report(status, msg):
         results["warn"] += 1
 
 
-def parse_yaml_frontmatter(filepath):
-    """Extract YAML frontmatter from a SKILL.md file."""
-    content = filepath.read_text()
-    match = re.match(r"^---\s*\n(.*?)\n---", content, re.DOTALL)
-    if not match:
-        return None, content
+@contextmanager
+def collect_reports():
+    """Record report() calls as (status, msg) instead of printing and counting them."""
+    global _collected
+    _collected = records = []
     try:
-        fm = yaml.safe_load(match.group(1))
-        return fm, content
-    except yaml.YAMLError:
-        return None, content
+        yield records
+    finally:
+        _collected = None
 
 
-def extract_reference_mentions(content, skill_name):
-    """Find all references/*.md mentions in a SKILL.md file.
+def selected(skills, skills_filter=None):
+    """`skills` limited to `skills_filter` (None = all), in order."""
+    return [skill for skill in skills if skills_filter is None or skill in skills_filter]
 
-    Filters out example references that point to OTHER skills' files,
-    and example file names used in documentation prose (e.g., finance.md, mnda.md).
-    """
-    # Match patterns like: references/filename.md, reference/filename.md
-    pattern = r"(?:references?)/([a-zA-Z0-9_-]+\.md)"
-    all_mentions = re.findall(pattern, content)
 
-    # Known example-only mentions in Anthropic-installed skills (prose examples, not real refs)
-    EXAMPLE_FILES = {
-        "creating-and-managing-skills": {"finance.md", "mnda.md", "policies.md", "api_docs.md", "schema.md"},
-    }
-    # extracting-patterns mentions other skills' references as integration examples
-    CROSS_SKILL_REFS = {
-        "extracting-patterns": {"langgraph-patterns.md", "state-machine-patterns.md", "llm-mocking.md"},
-    }
+def parse_yaml_frontmatter(skill_md):
+    """Extract YAML frontmatter from a SKILL.md file (path relative to the skills source)."""
+    content = SKILLS.read_text(skill_md)
+    return parse_frontmatter(content), content
 
-    exclude = EXAMPLE_FILES.get(skill_name, set()) | CROSS_SKILL_REFS.get(skill_name, set())
-    return [ref for ref in all_mentions if ref not in exclude]
 
-
-def test_all_skills_present():
+def test_all_skills_present(skills_filter=None):
     """Test 1: All 18 expected skills have directories and SKILL.md files."""
     print("\n== Test 1: All expected skills present ==")
-    for skill in EXPECTED_SKILLS:
-        skill_dir = SKILLS_DIR / skill
-        skill_md = skill_dir / "SKILL.md"
-        if not skill_dir.exists():
+    for skill in selected(EXPECTED_SKILLS, skills_filter):
+        if not SKILLS.is_dir(skill):
             report("fail", f"Missing directory: {skill}/")
-        elif not skill_md.exists():
+        elif not SKILLS.exists(f"{skill}/SKILL.md"):
             report("fail", f"Missing SKILL.md: {skill}/SKILL.md")
         else:
             report("pass", f"{skill}/SKILL.md exists")
@@ -104,11 +101,7 @@ def test_all_skills_present():
 def test_no_unexpected_skills():
     """Test 2: No unexpected skill directories."""
     print("\n== Test 2: No unexpected skill directories ==")
-    actual_dirs = {
-        d.name
-        for d in SKILLS_DIR.iterdir()
-        if d.is_dir() and not d.name.startswith(".")
-    }
+    actual_dirs = set(SKILLS.skill_names())
     expected_set = set(EXPECTED_SKILLS)
     unexpected = actual_dirs - expected_set
     if unexpected:
@@ -118,12 +111,12 @@ def test_no_unexpected_skills():
         report("pass", "No unexpected skill directories")
 
 
-def test_yaml_frontmatter():
+def test_yaml_frontmatter(skills_filter=None):
     """Test 3: All SKILL.md files have valid YAML frontmatter with required fields."""
     print("\n== Test 3: YAML frontmatter validation ==")
-    for skill in EXPECTED_SKILLS:
-        skill_md = SKILLS_DIR / skill / "SKILL.md"
-        if not skill_md.exists():
+    for skill in selected(EXPECTED_SKILLS, skills_filter):
+        skill_md = f"{skill}/SKILL.md"
+        if not SKILLS.exists(skill_md):
             continue
         fm, content = parse_yaml_frontmatter(skill_md)
         if fm is None:
@@ -152,58 +145,50 @@ def test_yaml_frontmatter():
             report("pass", f"{skill}: description field present")
 
 
-def test_workflow_structure():
+def test_workflow_structure(skills_filter=None):
     """Test 4: All SKILL.md files have a numbered workflow or instructions section."""
     print("\n== Test 4: Workflow/Instructions structure ==")
-    for skill in EXPECTED_SKILLS:
-        skill_md = SKILLS_DIR / skill / "SKILL.md"
-        if not skill_md.exists():
+    for skill in selected(EXPECTED_SKILLS, skills_filter):
+        skill_md = f"{skill}/SKILL.md"
+        if not SKILLS.exists(skill_md):
             continue
-        content = skill_md.read_text()
-        # Check for numbered steps (### Step N, ### N., or numbered list)
-        has_steps = bool(
-            re.search(r"###\s*(Step\s+)?\d+", content)
-            or re.search(r"^#{1,3}\s+\w+.*(?:Workflow|Instructions|Process|Flow)", content, re.MULTILINE)
-        )
-        has_numbered_list = bool(re.search(r"^\d+\.\s+\*\*", content, re.MULTILINE))
-        if has_steps or has_numbered_list:
+        # Numbered steps (### Step N, ### N.), a workflow heading, or a numbered bold list
+        if source_section_tree(SKILLS, skill_md).has_numbered_workflow():
             report("pass", f"{skill}: Has structured workflow/steps")
         else:
             report("warn", f"{skill}: No clear numbered workflow found")
 
 
-def test_reference_files_exist():
+def test_reference_files_exist(skills_filter=None):
     """Test 5: All reference files mentioned in SKILL.md actually exist."""
     print("\n== Test 5: Reference file existence ==")
-    for skill in EXPECTED_SKILLS:
-        skill_dir = SKILLS_DIR / skill
-        skill_md = skill_dir / "SKILL.md"
-        if not skill_md.exists():
+    for skill in selected(EXPECTED_SKILLS, skills_filter):
+        skill_md = f"{skill}/SKILL.md"
+        if not SKILLS.exists(skill_md):
             continue
-        content = skill_md.read_text()
+        content = SKILLS.read_text(skill_md)
         mentions = extract_reference_mentions(content, skill)
         if not mentions:
             report("pass", f"{skill}: No reference file mentions (OK)")
             continue
         for ref_file in mentions:
             # Check both references/ and reference/ directories
-            ref_path_plural = skill_dir / "references" / ref_file
-            ref_path_singular = skill_dir / "reference" / ref_file
-            if ref_path_plural.exists() or ref_path_singular.exists():
+            ref_path_plural = f"{skill}/references/{ref_file}"
+            ref_path_singular = f"{skill}/reference/{ref_file}"
+            if SKILLS.exists(ref_path_plural) or SKILLS.exists(ref_path_singular):
                 report("pass", f"{skill}: references/{ref_file} exists")
             else:
                 report("fail", f"{skill}: references/{ref_file} NOT FOUND")
 
 
-def test_directory_naming_consistency():
+def test_directory_naming_consistency(skills_filter=None):
     """Test 6: Reference directories use consistent 'references/' naming."""
     print("\n== Test 6: Directory naming consistency ==")
-    for skill in EXPECTED_SKILLS:
-        skill_dir = SKILLS_DIR / skill
-        if not skill_dir.exists():
+    for skill in selected(EXPECTED_SKILLS, skills_filter):
+        if not SKILLS.is_dir(skill):
             continue
-        has_plural = (skill_dir / "references").exists()
-        has_singular = (skill_dir / "reference").exists()
+        has_plural = SKILLS.is_dir(f"{skill}/references")
+        has_singular = SKILLS.is_dir(f"{skill}/reference")
         if has_plural and has_singular:
             report("fail", f"{skill}: Has BOTH reference/ AND references/ directories")
         elif has_singular and not has_plural:
@@ -214,28 +199,25 @@ def test_directory_naming_consistency():
             report("pass", f"{skill}: No reference directory (OK)")
 
 
-def test_reference_stubs():
-    """Test 7: Identify stub reference files (< 50 lines or contains 'TODO'/'stub')."""
+def test_reference_stubs(skills_filter=None):
+    """Test 7: Identify stub reference files (< 30 lines or contains 'TODO'/'stub')."""
     print("\n== Test 7: Reference file completeness ==")
     stub_count = 0
     complete_count = 0
-    for skill in EXPECTED_SKILLS:
-        refs_dir = SKILLS_DIR / skill / "references"
-        if not refs_dir.exists():
-            refs_dir = SKILLS_DIR / skill / "reference"
-        if not refs_dir.exists():
-            continue
-        for ref_file in sorted(refs_dir.glob("*.md")):
-            content = ref_file.read_text()
-            lines = len(content.splitlines())
-            has_stub_marker = bool(
-                re.search(r"\b(TODO|STUB|placeholder|expand after)\b", content, re.IGNORECASE)
-            )
-            if has_stub_marker or lines < 30:
-                report("warn", f"{skill}/references/{ref_file.name}: Stub ({lines} lines)")
-                stub_count += 1
-            else:
-                complete_count += 1
+    for skill in selected(EXPECTED_SKILLS, skills_filter):
+        skill_stubs = skill_complete = 0
+        for refs_dir in reference_dirs(SKILLS, skill):
+            for ref_name in SKILLS.list_files(f"{skill}/{refs_dir}"):
+                scan = source_stub_scan(SKILLS, f"{skill}/{refs_dir}/{ref_name}")
+                if scan.is_stub:
+                    report("warn", f"{skill}/{refs_dir}/{ref_name}: Stub ({scan.lines} lines)")
+                    skill_stubs += 1
+                else:
+                    skill_complete += 1
+        if skill_complete and not skill_stubs:
+            report("pass", f"{skill}: No stub reference files ({skill_complete} complete)")
+        stub_count += skill_stubs
+        complete_count += skill_complete
     print(f"  --- Summary: {complete_count} complete, {stub_count} stubs ---")
 
 
@@ -244,14 +226,14 @@ def test_trigger_overlaps():
     print("\n== Test 8: Trigger phrase overlap analysis ==")
     skill_triggers = {}
     for skill in EXPECTED_SKILLS:
-        skill_md = SKILLS_DIR / skill / "SKILL.md"
-        if not skill_md.exists():
+        skill_md = f"{skill}/SKILL.md"
+        if not SKILLS.exists(skill_md):
             continue
         fm, content = parse_yaml_frontmatter(skill_md)
         if fm and "description" in fm:
             desc = str(fm["description"]).lower()
             # Extract quoted trigger phrases
-            triggers = re.findall(r'"([^"]+)"', desc)
+            triggers = TRIGGER_PHRASE_RE.findall(desc)
             skill_triggers[skill] = triggers
 
     # Check for exact duplicate triggers
@@ -269,7 +251,7 @@ def test_trigger_overlaps():
         report("pass", "No exact trigger phrase overlaps")
 
 
-def test_exclusions_present():
+def test_exclusions_present(skills_filter=None):
     """Test 9: Skills with potential confusion have exclusions defined."""
     print("\n== Test 9: Exclusion clauses ==")
     # Skills that should have exclusions (related to other skills)
@@ -280,9 +262,9 @@ def test_exclusions_present():
         "testing-ai-systems": ["eval"],
         "evaluating-and-benchmarking": ["unit test"],
     }
-    for skill, keywords in should_have_exclusions.items():
-        skill_md = SKILLS_DIR / skill / "SKILL.md"
-        if not skill_md.exists():
+    for skill in selected(should_have_exclusions, skills_filter):
+        skill_md = f"{skill}/SKILL.md"
+        if not SKILLS.exists(skill_md):
             continue
         fm, _ = parse_yaml_frontmatter(skill_md)
         if fm and "description" in fm:
@@ -295,21 +277,34 @@ def test_exclusions_present():
 
 
 def test_catalog_completeness():
-    """Test 10: SKILL_CATALOG.md lists all 18 skills."""
+    """Test 10: SKILL_CATALOG.md lists exactly the skills the routing manifest holds."""
     print("\n== Test 10: Catalog completeness ==")
-    catalog = SKILLS_DIR / "SKILL_CATALOG.md"
-    if not catalog.exists():
+    manifest = build_manifest(SKILLS)
+    if not SKILLS.exists("SKILL_CATALOG.md"):
         report("fail", "SKILL_CATALOG.md not found")
-        return
-    content = catalog.read_text().lower()
-    for skill in EXPECTED_SKILLS:
-        if skill in content:
-            report("pass", f"Catalog mentions {skill}")
-        else:
-            report("fail", f"Catalog missing {skill}")
+    else:
+        listed = set(catalog_skill_names(SKILLS.read_text("SKILL_CATALOG.md")))
+        defined = {entry["name"] for entry in manifest["skills"]}
+        for skill in sorted(defined):
+            if skill in listed:
+                report("pass", f"Catalog lists {skill}")
+            else:
+                report("fail", f"Catalog missing {skill}")
+        for skill in sorted(listed - defined):
+            report("warn", f"Catalog lists {skill}, but no SKILL.md defines it")
+
+    stored = read_manifest(SKILLS)
+    if stored is None:
+        report("warn", f"{MANIFEST_NAME} not generated (python3 tests/routing_manifest.py --write)")
+    elif stored["hash"] == manifest["hash"]:
+        report("pass", f"{MANIFEST_NAME} matches every SKILL.md's routing fields")
+    else:
+        drift = manifest_drift(stored, manifest)
+        detail = "; ".join(f"{kind}: {', '.join(names)}" for kind, names in drift.items() if names)
+        report("fail", f"{MANIFEST_NAME} is stale ({detail}), regenerate with --write")
 
 
-def test_artifact_paths():
+def test_artifact_paths(skills_filter=None):
     """Test 11: Skills that produce artifacts define output paths."""
     print("\n== Test 11: Artifact output paths ==")
     # Skills expected to produce artifacts
@@ -320,22 +315,94 @@ def test_artifact_paths():
         "scaffolding-ai-project",
         "deploying-ai-systems",
     ]
-    for skill in artifact_skills:
-        skill_md = SKILLS_DIR / skill / "SKILL.md"
-        if not skill_md.exists():
+    for skill in selected(artifact_skills, skills_filter):
+        skill_md = f"{skill}/SKILL.md"
+        if not SKILLS.exists(skill_md):
             continue
-        content = skill_md.read_text()
-        has_artifact_path = bool(
-            re.search(r"\.claude/artifacts/", content)
-            or re.search(r"artifact", content, re.IGNORECASE)
-        )
-        if has_artifact_path:
+        stats = scan_skill_doc(SKILLS.read_text(skill_md))
+        if stats.artifact_paths or stats.mentions_artifact:
             report("pass", f"{skill}: Defines artifact output path")
         else:
             report("warn", f"{skill}: No artifact output path defined")
 
 
-if __name__ == "__main__":
+def test_token_budgets(skills_filter=None):
+    """Test 12: Token costs of metadata, SKILL.md bodies and references stay within budget."""
+    print("\n== Test 12: Token budgets ==")
+    costs = skill_token_report(SKILLS)
+    labels = {"metadata": "always-loaded metadata", "body": "SKILL.md body"}
+    for skill in selected(costs["skills"], skills_filter):
+        cost = costs["skills"][skill]
+        for kind in ("metadata", "body"):
+            status = budget_status(kind, cost[kind])
+            report(status, f"{skill}: {labels[kind]} ~{cost[kind]} tokens")
+        for ref_name, tokens in cost["references"].items():
+            status = budget_status("reference", tokens)
+            if status != "pass":
+                report(status, f"{skill}/{ref_name}: ~{tokens} tokens (over budget)")
+    if skills_filter is None:
+        report_metadata_total(costs)
+
+
+def report_metadata_total(costs):
+    """The catalog-wide part of Test 12: metadata of every skill, always loaded together."""
+    total = costs["metadata_total"]
+    if total > METADATA_TOTAL_BUDGET:
+        report("warn", f"Always-loaded metadata for all skills: ~{total} tokens (budget {METADATA_TOTAL_BUDGET})")
+    else:
+        report("pass", f"Always-loaded metadata for all skills: ~{total} tokens")
+
+
+@lru_cache(maxsize=1)
+def reference_graph():
+    """The reference graph of SKILLS, built once for Tests 13 and 14."""
+    return build_reference_graph(SKILLS)
+
+
+def test_dead_references():
+    """Test 13: Every reference file is reachable from some SKILL.md."""
+    print("\n== Test 13: Dead reference files ==")
+    graph = reference_graph()
+    dead = graph.dead
+    for key in dead:
+        report("warn", f"{key}: not mentioned by any SKILL.md (still copied on install)")
+    if not dead:
+        report("pass", f"All {len(graph.files)} reference files are reachable")
+
+
+def test_duplicate_references():
+    """Test 14: No identical or near-identical reference files across skills."""
+    print("\n== Test 14: Duplicate reference files ==")
+    graph = reference_graph()
+    exact, near = find_duplicates(SKILLS, graph.files)
+    for keys in exact:
+        report("warn", f"Identical references: {' = '.join(keys)}")
+    for a, b, similarity in near:
+        report("warn", f"Near-duplicate references ({similarity:.0%}): {a} ~ {b}")
+    if not exact and not near:
+        report("pass", "No duplicate reference content")
+
+
+def test_catalog_roots(catalog=None):
+    """Test 15: Skills merged from all roots don't shadow or collide with each other."""
+    if catalog is None:
+        with load_catalog() as catalog:
+            return test_catalog_roots(catalog)
+    print("\n== Test 15: Multi-root catalog ==")
+    labels = ", ".join(f"{root.label} ({len(root.entries)})" for root in catalog.roots)
+    report("pass", f"{len(catalog.skills)} routable skills from roots: {labels}")
+    conflicts = catalog.conflicts
+    for winner, loser in catalog.shadowed:
+        if (winner, loser) in conflicts:
+            report("warn", f"{winner.name}: [{winner.root}] shadows a DIFFERENT version in [{loser.root}]")
+        else:
+            report("warn", f"{winner.name}: [{winner.root}] shadows an identical copy in [{loser.root}]")
+    for trigger, owners in catalog.trigger_collisions.items():
+        who = ", ".join(f"{e.name} [{e.root}]" for e in owners)
+        report("warn", f"Trigger '{trigger}' collides across roots: {who}")
+
+
+def main(argv=None):
     print("=" * 60)
     print("  AGENT SKILL KIT — STRUCTURAL VALIDATION")
     print("=" * 60)
@@ -351,11 +418,18 @@ if __name__ == "__main__":
     test_exclusions_present()
     test_catalog_completeness()
     test_artifact_paths()
+    test_token_budgets()
+    test_dead_references()
+    test_duplicate_references()
+    test_catalog_roots()
 
     print("\n" + "=" * 60)
     total = results["pass"] + results["fail"] + results["warn"]
     print(f"  RESULTS: {results['pass']} passed, {results['fail']} failed, {results['warn']} warnings  (total: {total})")
     print("=" * 60)
 
-    if results["fail"] > 0:
-        sys.exit(1)
+    return 1 if results["fail"] > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Token-cost accounting for skills and references.
+
+Estimates how many context tokens each piece of the kit costs once it is
+loaded: the SKILL.md frontmatter (always loaded, for routing), the SKILL.md
+body (loaded when the skill triggers) and each reference file (loaded on
+demand). The estimator is an offline approximation of a BPE tokenizer:
+GPT-style pre-tokenization followed by a per-piece subword estimate. It has
+not been calibrated against a real tokenizer, so treat counts as relative
+sizes for budgets and comparisons, not exact token figures. Counts are
+cached per file.
+
+Run: python3 tests/token_costs.py [--json]
+"""
+
+import hashlib
+import json
+import re
+import sys
+
+from skill_docs import cache_get, cache_put
+from skill_source import as_skill_source, default_skill_source, reference_dirs
+
+TOKENIZER_VERSION = 1
+
+# (warn, fail) thresholds in estimated tokens
+TOKEN_BUDGETS = {
+    "metadata": (250, 400),  # per-skill frontmatter, always in context
+    "body": (5000, 8000),  # SKILL.md body, loaded on trigger
+    "reference": (8000, 15000),  # one reference file, loaded on demand
+}
+# All frontmatter together, always in context: a fixed share of the context
+# window however many skills are installed (about 1.5% of 200k tokens)
+METADATA_TOTAL_BUDGET = 3000
+
+# GPT-2/cl100k-style pre-tokenization: contractions, words with their
+# leading space, 1-3 digit groups, punctuation runs, whitespace runs
+PRETOKEN_RE = re.compile(r"'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|_+|\s+")
+FRONTMATTER_RE = re.compile(r"^---\s*\n.*?\n---[^\n]*\n?", re.DOTALL)
+
+
+def estimate_tokens(text):
+    """Estimate the BPE token count of `text`."""
+    tokens = 0
+    for piece in PRETOKEN_RE.findall(text):
+        first = piece[0]
+        if first == " " and len(piece) > 1:
+            piece = piece[1:]
+            first = piece[0]
+        if first.isalpha():
+            # Common words are single tokens; long words split into ~4-char subwords
+            tokens += 1 + max(0, len(piece) - 6) // 4
+        elif first.isdigit() or first.isspace() or first == "'":
+            tokens += 1
+        else:
+            # Markdown punctuation runs (```, ##, ---, **) merge into few tokens
+            tokens += 1 + (len(piece) - 1) // 3
+    return tokens
+
+
+def split_frontmatter(content):
+    """Split SKILL.md content into (frontmatter, body)."""
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        return "", content
+    return match.group(0), content[match.end():]
+
+
+_counts = {}  # (cache id, fingerprint) -> counts, for this process
+
+
+def count_tokens(source, relpath):
+    """Token counts for a file in a skill source: {"frontmatter": n, "body": n}.
+
+    Non-SKILL.md files have no frontmatter, so everything is body. Results
+    are cached in memory and in .skill-cache/, keyed by the file's identity
+    and fingerprint (size/mtime on disk, CRC/size in a bundle).
+    """
+    cache_id = source.cache_id(relpath)
+    fingerprint = list(source.fingerprint(relpath))
+    key = (cache_id, tuple(fingerprint))
+    if key in _counts:
+        return _counts[key]
+
+    path_key = hashlib.sha256(cache_id.encode("utf-8")).hexdigest()
+    record = cache_get("tokens", path_key)
+    if record and record.get("version") == TOKENIZER_VERSION and record.get("fingerprint") == fingerprint:
+        counts = record["counts"]
+    else:
+        content = source.read_text(relpath)
+        is_skill_md = relpath.rsplit("/", 1)[-1] == "SKILL.md"
+        frontmatter, body = split_frontmatter(content) if is_skill_md else ("", content)
+        counts = {"frontmatter": estimate_tokens(frontmatter), "body": estimate_tokens(body)}
+        cache_put("tokens", path_key, {
+            "version": TOKENIZER_VERSION,
+            "fingerprint": fingerprint,
+            "counts": counts,
+        })
+    _counts[key] = counts
+    return counts
+
+
+def skill_token_report(source=None):
+    """Per-skill token costs plus catalog totals.
+
+    `source` is a skill source or a path (directory or bundle); defaults to
+    default_skill_source(). Returns {"skills": {name: {...}},
+    "metadata_total": n, "triggered_total": n} where a skill's "triggered"
+    cost is its body plus every reference, keyed "references/<file>" (or
+    legacy "reference/<file>").
+    """
+    source = default_skill_source() if source is None else as_skill_source(source)
+    skills = {}
+    for skill in source.skill_names():
+        if not source.exists(f"{skill}/SKILL.md"):
+            continue
+        counts = count_tokens(source, f"{skill}/SKILL.md")
+        refs = {}
+        for refs_dir in reference_dirs(source, skill):
+            for ref_name in source.list_files(f"{skill}/{refs_dir}"):
+                refs[f"{refs_dir}/{ref_name}"] = count_tokens(source, f"{skill}/{refs_dir}/{ref_name}")["body"]
+        skills[skill] = {
+            "metadata": counts["frontmatter"],
+            "body": counts["body"],
+            "references": refs,
+            "references_total": sum(refs.values()),
+            "triggered": counts["body"] + sum(refs.values()),
+        }
+    return {
+        "skills": skills,
+        "metadata_total": sum(s["metadata"] for s in skills.values()),
+        "triggered_total": sum(s["triggered"] for s in skills.values()),
+    }
+
+
+def budget_status(kind, tokens):
+    """'pass', 'warn' or 'fail' for a token count against TOKEN_BUDGETS[kind]."""
+    warn, fail = TOKEN_BUDGETS[kind]
+    if tokens > fail:
+        return "fail"
+    if tokens > warn:
+        return "warn"
+    return "pass"
+
+
+if __name__ == "__main__":
+    report = skill_token_report()
+    if "--json" in sys.argv[1:]:
+        print(json.dumps(report, indent=2))
+        sys.exit(0)
+
+    print("=" * 72)
+    print("  AGENT SKILL KIT — TOKEN COSTS (estimated)")
+    print("=" * 72)
+    print(f"  {'skill':<32} {'metadata':>9} {'body':>7} {'refs':>5} {'ref tok':>8} {'triggered':>10}")
+    for name, s in report["skills"].items():
+        print(
+            f"  {name:<32} {s['metadata']:>9} {s['body']:>7} {len(s['references']):>5}"
+            f" {s['references_total']:>8} {s['triggered']:>10}"
+        )
+    print("-" * 72)
+    print(f"  Always-loaded metadata (all skills): {report['metadata_total']} tokens")
+    print(f"  Everything loaded (all skills triggered, all references): {report['triggered_total']} tokens")
+    print("=" * 72)